@@ -0,0 +1,95 @@
+# ============================================
+# ⏱️ MICRO-BENCHMARK — response cleaning
+# Old one-shot clean_response (5 uncompiled regexes over the full reply)
+# vs the precompiled StreamingCleaner, one-shot and fed token by token
+#
+# Run:   python -m benchmarks.bench_response_cleaner [--replies 2000]
+# ============================================
+
+import re
+import time
+import random
+import argparse
+from engine.response_cleaner import StreamingCleaner, clean_text
+
+# ============================================
+# 🧪 Reference Implementation (before the streaming cleaner)
+# ============================================
+
+
+def legacy_clean_response(text: str) -> str:
+    text = re.sub(r"\*.*?\*", "", text)
+    text = re.sub(r"\.{2,}", ".", text)
+    text = re.sub(r"\b(sighs|gulps|uh|um)[^\.!?]*[\.!?]?", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"\b([A-Za-z])-([A-Za-z]+)\b", r"\2", text)
+    text = re.sub(r'\s{2,}', ' ', text).strip()
+    return text
+
+# ============================================
+# 📝 Synthetic Replies
+# ============================================
+
+SENTENCES = [
+    "It started about three days ago, doctor.",
+    "*shifts uncomfortably* It's a tight feeling in my chest...",
+    "I-I don't really know what brought it on.",
+    "Sighs and looks at the floor.",
+    "It gets w-w-worse when I climb the stairs.",
+    "No, I've never smoked.",
+    "I had an X-ray last year and it was fine.",
+    "My dad had heart problems, I think...",
+]
+
+
+def make_replies(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+
+
+def tokenize(reply: str) -> list:
+    # Groq deltas are roughly word-sized pieces with leading spaces
+    words = reply.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+# ============================================
+# ⏱️ Timing
+# ============================================
+
+
+def bench(label: str, func, replies: list, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for reply in replies:
+            func(reply)
+        best = min(best, time.perf_counter() - start)
+    per_reply = best / len(replies) * 1e6
+    print(f"{label:<34} {best * 1000:8.2f} ms total  {per_reply:7.2f} µs/reply")
+
+
+def streamed(tokens: list) -> str:
+    cleaner = StreamingCleaner()
+    out = [cleaner.feed(t) for t in tokens]
+    out.append(cleaner.flush())
+    return "".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response cleaner micro-benchmark")
+    parser.add_argument("--replies", type=int, default=2000)
+    args = parser.parse_args()
+
+    replies = make_replies(args.replies)
+    tokenized = [tokenize(r) for r in replies]
+
+    bench("legacy clean_response (one-shot)", legacy_clean_response, replies)
+    bench("StreamingCleaner (one-shot)", clean_text, replies)
+    bench("StreamingCleaner (per token)", streamed, tokenized)
+
+    mismatched = sum(1 for r, t in zip(replies, tokenized) if streamed(t) != clean_text(r))
+    changed = sum(1 for r in replies if clean_text(r) != legacy_clean_response(r))
+    print(f"\nstreamed ≠ one-shot: {mismatched}  |  new ≠ legacy output: {changed}/{len(replies)}")
+
+
+if __name__ == "__main__":
+    main()
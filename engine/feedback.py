@@ -3,55 +3,54 @@
 # PURPOSE: Track doctor questions and generate report
 # ============================================
 
-import requests
-import os
-from core.runner_globals import SESSION_LOG
+from engine.groq_client import get_groq_client
+from engine.llm_scheduler import PRIORITY_FEEDBACK, SchedulerBusy
+from engine.model_router import MODEL_ROUTER, ROUTE_EXAMINER
+from engine.question_tagger import QUESTION_TAGGER
+from runner.case_model import as_case
+from runner.near_duplicates import NearDuplicateIndex
 
 FEEDBACK_LOG = {
     "data_gathering": set(),
     "interpersonal": set(),
     "management": set(),
     "repetitions": 0,
-    "asked_questions": set()
+    "asked_questions": set(),
+    "question_index": NearDuplicateIndex()
 }
 
 
-def track_question(doctor_input: str):
-    """Classify question by domain and track repetition."""
-    text = doctor_input.lower()
+def track_question(doctor_input: str, session_log=None) -> frozenset:
+    """
+    Classify question by domain and track repetition.
 
-    if doctor_input in FEEDBACK_LOG["asked_questions"]:
-        FEEDBACK_LOG["repetitions"] += 1
-    else:
-        FEEDBACK_LOG["asked_questions"].add(doctor_input)
+    Keywords live in data/question_tags.json (see engine/question_tagger.py).
+    Repeats are matched approximately (runner/near_duplicates.py), so STT
+    rewordings count too. If a session log is given, everything goes into
+    it (question_tags, duplicate_questions) for the examiner prompt and
+    FEEDBACK_LOG is left alone; without one (CLI runs) FEEDBACK_LOG is
+    the log.
+    """
+    # 🧠 Data Gathering · 💬 ICE · 💊 Management — one pass
+    tags = QUESTION_TAGGER.tag(doctor_input)
 
-    # 🧠 Data Gathering
-    if any(k in text for k in ["pain", "duration", "radiate", "severity", "trigger", "location"]):
-        FEEDBACK_LOG["data_gathering"].add("symptom_analysis")
-    if "medication" in text or "drugs" in text:
-        FEEDBACK_LOG["data_gathering"].add("medications")
-    if "allerg" in text:
-        FEEDBACK_LOG["data_gathering"].add("allergies")
-    if "family" in text:
-        FEEDBACK_LOG["data_gathering"].add("family_history")
-
-    # 💬 ICE (Ideas, Concerns, Expectations)
-    if any(k in text for k in ["what do you think", "your idea", "what's causing", "what's going on"]):
-        FEEDBACK_LOG["interpersonal"].add("idea")
-    if any(k in text for k in ["are you worried", "any concerns", "bother you", "worried about"]):
-        FEEDBACK_LOG["interpersonal"].add("concern")
-    if any(k in text for k in ["what do you expect", "what are you hoping", "would you like"]):
-        FEEDBACK_LOG["interpersonal"].add("expectation")
-
-    # 💊 Management
-    if any(k in text for k in ["admit", "admission", "hospital", "stay in"]):
-        FEEDBACK_LOG["management"].add("admission")
-    if any(k in text for k in ["treatment", "medication", "painkiller", "aspirin", "spray"]):
-        FEEDBACK_LOG["management"].add("treatment")
-    if any(k in text for k in ["follow-up", "gp", "review", "see you again"]):
-        FEEDBACK_LOG["management"].add("followup")
-    if any(k in text for k in ["safety", "red flag", "come back", "warning sign"]):
-        FEEDBACK_LOG["management"].add("safety_netting")
+    if session_log is None:
+        FEEDBACK_LOG["asked_questions"].add(doctor_input)
+        if FEEDBACK_LOG["question_index"].add(doctor_input) is not None:
+            FEEDBACK_LOG["repetitions"] += 1
+        for domain, tag in tags:
+            FEEDBACK_LOG[domain].add(tag)
+        return tags
+
+    repeat = session_log.question_index.add(doctor_input)
+    if repeat is not None:
+        earlier, similarity = repeat
+        session_log["duplicate_questions"].append(
+            {"question": doctor_input, "repeats": earlier, "similarity": similarity})
+    for domain, tag in tags:
+        if tag not in session_log["question_tags"][domain]:
+            session_log["question_tags"][domain].append(tag)
+    return tags
 
 
 def generate_report(case_id: str):
@@ -95,26 +94,18 @@ def generate_report(case_id: str):
     print("\n📘 Tip: Review missed areas before the next station!\n")
 
 
-def generate_examiner_comment(session_log, case):
-    try:
-        prompt = f"""
+EXAMINER_SYSTEM_PROMPT = "You are a senior UKMLA OSCE examiner giving structured feedback."
+EXAMINER_FALLBACK = "⚠️ AI Feedback could not be generated. Please try again later."
+
+
+def build_examiner_messages(session_log, case) -> list:
+    case = as_case(case)
+    prompt = f"""
 You are a UKMLA OSCE examiner providing structured and professional feedback.
 
 =========================
 🧾 CASE DETAILS:
-- Station: {case.get('station_name', 'N/A')}
-- Diagnosis: {case.get('diagnosis', 'N/A')}
-- Presenting Complaint: {case.get('presenting_complaint', 'N/A')}
-- Symptoms: {', '.join(case.get('symptoms', []))}
-- Red Flags: {', '.join(case.get('red_flags', []))}
-- Differentials: {', '.join(case.get('differentials', []))}
-- PMH: {', '.join(case.get('medical_history', []))}
-- Medications: {', '.join(case.get('medications', []))}
-- Family History: {', '.join(case.get('family_history', []))}
-- Social History: Smoking: {case['social_history'].get('smoking', 'N/A')}, Alcohol: {case['social_history'].get('alcohol', 'N/A')}, Diet: {case['social_history'].get('diet', 'N/A')}, Exercise: {case['social_history'].get('exercise', 'N/A')}
-- ICE: Ideas: {case['ice'].get('ideas', '')} | Concerns: {case['ice'].get('concerns', '')} | Expectations: {case['ice'].get('expectations', '')}
-- Exam Findings: {case.get('exam_findings', 'N/A')}
-- Investigation Findings: {case.get('investigation_findings', 'N/A')}
+{case.examiner_case_details}
 =========================
 
 💬 QUESTIONS: {session_log['questions']}
@@ -132,27 +123,31 @@ Give feedback under these headings:
 8. Investigations
 9. One Improvement Suggestion
 """
+    return [
+        {"role": "system", "content": EXAMINER_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
 
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {os.getenv('GROQ_API_KEY')}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "llama3-70b-8192",
-            "messages": [
-                {"role": "system", "content": "You are a senior UKMLA OSCE examiner giving structured feedback."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.4,
-            "max_tokens": 800
-        }
-
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        result = response.json()
-        return result["choices"][0]["message"]["content"].strip().replace("**", "")
 
+def generate_examiner_comment(session_log, case):
+    try:
+        content = get_groq_client().chat_sync(
+            build_examiner_messages(session_log, case), MODEL_ROUTER.pick(ROUTE_EXAMINER),
+            temperature=0.4, max_tokens=800, priority=PRIORITY_FEEDBACK)
+        return content.strip().replace("**", "")
+    except Exception as e:
+        print(f"⚠️ Examiner Feedback Error: {e}")
+        return EXAMINER_FALLBACK
+
+
+async def generate_examiner_comment_async(session_log, case):
+    try:
+        content = await get_groq_client().chat(
+            build_examiner_messages(session_log, case), MODEL_ROUTER.pick(ROUTE_EXAMINER),
+            temperature=0.4, max_tokens=800, priority=PRIORITY_FEEDBACK)
+        return content.strip().replace("**", "")
+    except SchedulerBusy:
+        raise   # surfaced to the client as 429 + Retry-After
     except Exception as e:
         print(f"⚠️ Examiner Feedback Error: {e}")
-        return "⚠️ AI Feedback could not be generated. Please try again later."
+        return EXAMINER_FALLBACK
@@ -0,0 +1,321 @@
+# ============================================
+# 🌐 GROQ HTTP CLIENT
+# One shared keep-alive connection pool for every Groq call
+# (patient replies + examiner feedback), async-native for FastAPI
+# ============================================
+
+import os
+import json
+import time
+import asyncio
+import itertools
+import threading
+import httpx
+from dotenv import load_dotenv
+from engine.single_flight import SingleFlight, fingerprint
+from engine.resilience import Resilience, CircuitOpenError
+from engine.llm_scheduler import LLM_SCHEDULER, PRIORITY_LIVE, estimate_cost
+from engine.model_router import MODEL_ROUTER, LATENCY_FIRST_TOKEN, LATENCY_TOTAL
+
+# ============================================
+# 🔑 Settings
+# ============================================
+
+load_dotenv()
+
+# Point at a local stand-in (groq_standin.py) for offline load tests:
+# GROQ_BASE_URL=http://127.0.0.1:8001/openai/v1
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1").rstrip("/")
+GROQ_API_URL = f"{GROQ_BASE_URL}/chat/completions"
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "30"))
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+GROQ_MAX_KEEPALIVE = int(os.getenv("GROQ_MAX_KEEPALIVE", "10"))
+GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "60"))
+GROQ_SINGLE_FLIGHT = os.getenv("GROQ_SINGLE_FLIGHT", "1") != "0"   # coalesce identical requests
+
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx when installed
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# ============================================
+# 🌐 GROQ CLIENT
+# ============================================
+
+
+class GroqClient:
+    """
+    Pooled client for the Groq OpenAI-compatible chat endpoint.
+
+    The async pool is created lazily on the running event loop and
+    reused for every call on that loop; a separate sync pool serves
+    scripts that are not async. Identical concurrent requests are
+    coalesced into one upstream call when single_flight is on; that call
+    waits once for the shared LLM scheduler to admit it and then goes
+    through that model's resilience layer (retries, hedging, breaker)
+    within whatever is left of the deadline; each retry or hedge is
+    charged to the scheduler's buckets as well. Per-model latency (time to
+    first token for streams) and errors are fed to the model router.
+    """
+
+    def __init__(self, api_key: str | None = None, url: str = GROQ_API_URL,
+                 timeout: float = GROQ_TIMEOUT, max_connections: int = GROQ_MAX_CONNECTIONS,
+                 max_keepalive: int = GROQ_MAX_KEEPALIVE, single_flight: bool = GROQ_SINGLE_FLIGHT):
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.url = url
+        self.timeout = httpx.Timeout(timeout, connect=GROQ_CONNECT_TIMEOUT)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=GROQ_KEEPALIVE_EXPIRY,
+        )
+        self._async_client = None
+        self._async_loop = None
+        self._sync_client = None
+        self._lock = threading.Lock()
+        self.flights = SingleFlight() if single_flight else None
+        self._resilience = {}   # model -> Resilience (own breaker + latency windows)
+        self.scheduler = LLM_SCHEDULER
+        self.models = MODEL_ROUTER
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    # ----------------------------------------
+    # 🏊 Connection Pools
+    # ----------------------------------------
+
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers, timeout=self.timeout,
+                limits=self.limits, http2=HTTP2_AVAILABLE)
+            self._async_loop = loop
+        return self._async_client
+
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = httpx.Client(
+                        headers=self.headers, timeout=self.timeout,
+                        limits=self.limits, http2=HTTP2_AVAILABLE)
+        return self._sync_client
+
+    # ----------------------------------------
+    # 💬 Chat Completions
+    # ----------------------------------------
+
+    def resilience_for(self, model: str) -> Resilience:
+        """One breaker per model, so a failing fallback cannot trip the primary."""
+        resilience = self._resilience.get(model)
+        if resilience is None:
+            with self._lock:
+                resilience = self._resilience.setdefault(model, Resilience())
+        return resilience
+
+    def _observe(self, model: str, seconds: float, error: Exception | None = None, kind: str = LATENCY_TOTAL):
+        # A breaker rejection never reached the model
+        if not isinstance(error, CircuitOpenError):
+            self.models.record(model, seconds, ok=error is None, kind=kind)
+
+    async def _admit(self, resilience: Resilience, priority: int, cost: int) -> float:
+        """
+        One scheduler slot per logical call (retries and hedges ride on it),
+        bounded by the deadline. Returns the seconds of deadline left.
+        """
+        queued = time.monotonic()
+        await self.scheduler.acquire(priority, cost, timeout=resilience.deadline)
+        return resilience.deadline - (time.monotonic() - queued)
+
+    def _admit_sync(self, resilience: Resilience, priority: int, cost: int) -> float:
+        queued = time.monotonic()
+        self.scheduler.acquire_sync(priority, cost, timeout=resilience.deadline)
+        return resilience.deadline - (time.monotonic() - queued)
+
+    def _metered(self, func, cost: int):
+        """
+        Wraps a per-attempt call function: the first attempt rides on the
+        admitted slot, every retry or hedge after it is charged to the
+        scheduler's buckets, so upstream traffic stays within RPM/TPM.
+        """
+        attempts = itertools.count()
+
+        def attempt(timeout):
+            if next(attempts):
+                self.scheduler.charge(cost)
+            return func(timeout)
+        return attempt
+
+    @staticmethod
+    def build_payload(messages: list, model: str, temperature: float, max_tokens: int) -> dict:
+        return {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    async def chat(self, messages: list, model: str, temperature: float = 0.6,
+                   max_tokens: int = 300, timeout: float | None = None,
+                   priority: int = PRIORITY_LIVE) -> str:
+        """
+        Sends one chat completion and returns the message content.
+
+        Raises:
+            httpx.HTTPError: On connection errors, timeouts and non-2xx replies
+            SchedulerBusy: Queue too deep, or not admitted before the deadline
+        """
+        payload = self.build_payload(messages, model, temperature, max_tokens)
+        cost = estimate_cost(messages, max_tokens)
+
+        resilience = self.resilience_for(model)
+
+        async def call():
+            deadline = await self._admit(resilience, priority, cost)
+            started = time.monotonic()
+            try:
+                result = await resilience.call(
+                    self._metered(lambda t: self._post(payload, timeout or t), cost), key="call", deadline=deadline)
+            except Exception as e:
+                self._observe(model, time.monotonic() - started, e)
+                raise
+            self._observe(model, time.monotonic() - started)
+            return result
+
+        if self.flights is None:
+            return await call()
+        return await self.flights.do(fingerprint(payload), call)
+
+    async def _post(self, payload: dict, timeout: float) -> str:
+        response = await self.async_client().post(self.url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def chat_stream(self, messages: list, model: str, temperature: float = 0.6,
+                          max_tokens: int = 300, timeout: float | None = None,
+                          priority: int = PRIORITY_LIVE):
+        """
+        Streams a chat completion ("stream": true) and yields each content
+        delta as it arrives.
+
+        Raises:
+            httpx.HTTPError: On connection errors, timeouts and non-2xx replies
+            SchedulerBusy: Queue too deep, or not admitted before the deadline
+        """
+        payload = self.build_payload(messages, model, temperature, max_tokens)
+        payload["stream"] = True
+        cost = estimate_cost(messages, max_tokens)
+
+        resilience = self.resilience_for(model)
+
+        async def call():
+            deadline = await self._admit(resilience, priority, cost)
+            started = time.monotonic()
+            first_token = None
+            try:
+                async for delta in resilience.stream(
+                        self._metered(lambda t: self._post_stream(payload, timeout or t), cost),
+                        key="stream", deadline=deadline):
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    yield delta
+            except Exception as e:
+                self._observe(model, time.monotonic() - started, e, LATENCY_FIRST_TOKEN)
+                raise
+            self._observe(model, first_token if first_token is not None else time.monotonic() - started,
+                          kind=LATENCY_FIRST_TOKEN)
+
+        deltas = call() if self.flights is None else self.flights.stream(fingerprint(payload), call)
+        async for delta in deltas:
+            yield delta
+
+    async def _post_stream(self, payload: dict, timeout: float):
+        async with self.async_client().stream("POST", self.url, json=payload, timeout=timeout) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+    def chat_sync(self, messages: list, model: str, temperature: float = 0.6,
+                  max_tokens: int = 300, timeout: float | None = None,
+                  priority: int = PRIORITY_LIVE) -> str:
+        """Blocking twin of chat() for non-async scripts."""
+        payload = self.build_payload(messages, model, temperature, max_tokens)
+        cost = estimate_cost(messages, max_tokens)
+
+        resilience = self.resilience_for(model)
+
+        def call():
+            deadline = self._admit_sync(resilience, priority, cost)
+            started = time.monotonic()
+            try:
+                result = resilience.call_sync(
+                    self._metered(lambda t: self._post_sync(payload, timeout or t), cost),
+                    key="call", deadline=deadline)
+            except Exception as e:
+                self._observe(model, time.monotonic() - started, e)
+                raise
+            self._observe(model, time.monotonic() - started)
+            return result
+
+        if self.flights is None:
+            return call()
+        return self.flights.do_sync(fingerprint(payload), call)
+
+    def _post_sync(self, payload: dict, timeout: float) -> str:
+        response = self.sync_client().post(self.url, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    def stats(self) -> dict:
+        return {
+            "single_flight": self.flights.stats() if self.flights else None,
+            "resilience": {model: r.stats() for model, r in list(self._resilience.items())},
+            "scheduler": self.scheduler.stats(),
+            "models": self.models.stats(),
+        }
+
+    # ----------------------------------------
+    # 🧹 Shutdown
+    # ----------------------------------------
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+# ============================================
+# 🌍 Shared Client
+# ============================================
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_groq_client() -> GroqClient:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = GroqClient()
+    return _CLIENT
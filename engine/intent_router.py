@@ -0,0 +1,180 @@
+# ============================================
+# ⚡ LOCAL INTENT FAST-PATH
+# Answers structured history questions (smoking, meds, family history…)
+# straight from the case JSON; only open-ended questions go to Groq
+# ============================================
+
+import re
+import random
+import threading
+
+# ============================================
+# 🧭 Intent Patterns
+# ============================================
+
+INTENT_PATTERNS = {
+    "smoking": re.compile(r"\b(smoke|smoker|smoking|cigarettes?|tobacco|vape|vaping)\b"),
+    "alcohol": re.compile(r"\b(alcohol|drink|drinking|drinker|units|pints?|beer|wine)\b"),
+    "diet": re.compile(r"\b(diet|what do you (usually |normally )?eat|eating habits|healthy (food|eating))\b"),
+    "exercise": re.compile(r"\b(exercise|exercising|gym|sports?|physically active|keep active)\b"),
+    # Not "drugs"/"pills": "do you take any drugs?" asks about recreational use
+    "medications": re.compile(r"\b(medications?|medicines?|tablets?|prescriptions?)\b"),
+    "allergies": re.compile(r"\b(allerg(y|ies|ic))\b"),
+    "family_history": re.compile(r"\b(family|parents?|mother|father|mum|dad|siblings?|brothers?|sisters?)\b.*\b(history|problems?|conditions?|illness(es)?|run|had|have|heart|medical)\b"
+                                 r"|\b(runs? in (the|your) family)\b"),
+    "presenting_complaint": re.compile(r"\b(what brings you|what brought you|how can i help|what seems to be|what's the (problem|matter)|what is the (problem|matter)|what can i do for you)\b"),
+    "closure": re.compile(r"\b(any (other )?questions|anything else (you'?d like|you want) to (ask|know)|is there anything else)\b"),
+}
+
+# Questions that ask for timing, reasons or narrative need the LLM
+_OPEN_ENDED = re.compile(r"\b(why|when|how long|how often|since|describe|tell me (more|about)|explain|what made|what happened)\b")
+
+MAX_FAST_PATH_WORDS = 14
+
+# ============================================
+# 💬 Answer Builders
+# ============================================
+
+_NEGATIVE = re.compile(r"^(no|non|never|none|nil|doesn'?t|don'?t)\b", re.IGNORECASE)
+
+
+def _social(case, field: str) -> str | None:
+    value = case.social_history.get(field)
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _answer_smoking(case, family_reply):
+    value = _social(case, "smoking")
+    if value is None:
+        return None
+    if _NEGATIVE.match(value):
+        return "No, I don't smoke, doctor."
+    return f"Yes, I do — about {value}."
+
+
+def _answer_alcohol(case, family_reply):
+    value = _social(case, "alcohol")
+    if value is None:
+        return None
+    if _NEGATIVE.match(value):
+        return "No, I don't drink at all."
+    return f"Only {value}, doctor." if value.lower() == "occasional" else f"I'd say {value}."
+
+
+def _answer_diet(case, family_reply):
+    value = _social(case, "diet")
+    return f"Honestly, my diet is {value}." if value else None
+
+
+def _answer_exercise(case, family_reply):
+    value = _social(case, "exercise")
+    if value is None:
+        return None
+    return f"Not much — {value}, really." if value.lower() in ("minimal", "none") else f"Just {value}, doctor."
+
+
+# A field the case does not fill in is unknown, not a negative: those
+# questions go to the LLM instead of being answered "no"
+def _answer_medications(case, family_reply):
+    if case.get("medications") is None:
+        return None
+    if not case.medications:
+        return "I'm not on any regular medication."
+    return f"I take {', '.join(case.medications)}."
+
+
+def _answer_allergies(case, family_reply):
+    allergies = case.get("allergies")
+    if allergies is None:
+        return None
+    if isinstance(allergies, str):
+        allergies = allergies.strip()
+        if allergies and not _NEGATIVE.match(allergies):
+            return f"Yes — {allergies}."
+    elif isinstance(allergies, (list, tuple)) and allergies:
+        return f"Yes, I'm allergic to {', '.join(allergies)}."
+    return "No, no allergies that I know of."
+
+
+def _answer_family_history(case, family_reply):
+    return family_reply(case.station_id, case.diagnosis)
+
+
+def _answer_presenting_complaint(case, family_reply):
+    return random.choice(case.presenting_complaint) if case.presenting_complaint else None
+
+
+def _answer_closure(case, family_reply):
+    return random.choice(case.closure_lines) if case.closure_lines else None
+
+
+ANSWER_BUILDERS = {
+    "smoking": _answer_smoking,
+    "alcohol": _answer_alcohol,
+    "diet": _answer_diet,
+    "exercise": _answer_exercise,
+    "medications": _answer_medications,
+    "allergies": _answer_allergies,
+    "family_history": _answer_family_history,
+    "presenting_complaint": _answer_presenting_complaint,
+    "closure": _answer_closure,
+}
+
+# ============================================
+# ⚡ INTENT ROUTER
+# ============================================
+
+
+class IntentRouter:
+    """
+    Matches a doctor question to at most one structured intent.
+
+    A question is only answered locally when exactly one intent matches,
+    it is short, and it does not ask for timing/reasons/narrative.
+    """
+
+    def __init__(self, max_words: int = MAX_FAST_PATH_WORDS):
+        self.max_words = max_words
+        self._lock = threading.Lock()
+        self.total = 0
+        self.hits = 0
+        self.by_intent = {name: 0 for name in INTENT_PATTERNS}
+
+    def classify(self, user_input: str) -> str | None:
+        text = user_input.lower().strip()
+        if not text or len(text.split()) > self.max_words or _OPEN_ENDED.search(text):
+            return None
+        matched = [name for name, pattern in INTENT_PATTERNS.items() if pattern.search(text)]
+        return matched[0] if len(matched) == 1 else None
+
+    def answer(self, user_input: str, case, family_reply) -> str | None:
+        """
+        Returns a local answer, or None to send the question to the LLM.
+
+        Args:
+            user_input (str): Doctor's question
+            case (Case): Compiled case
+            family_reply (callable): get_family_history_reply(station_id, diagnosis)
+        """
+        intent = self.classify(user_input)
+        reply = ANSWER_BUILDERS[intent](case, family_reply) if intent else None
+        with self._lock:
+            self.total += 1
+            if reply:
+                self.hits += 1
+                self.by_intent[intent] += 1
+        return reply
+
+    def stats(self) -> dict:
+        return {
+            "questions": self.total,
+            "fast_path_hits": self.hits,
+            "hit_rate": round(self.hits / self.total, 4) if self.total else 0.0,
+            "by_intent": dict(self.by_intent),
+        }
+
+# ============================================
+# 🌍 Shared Router
+# ============================================
+
+INTENT_ROUTER = IntentRouter()
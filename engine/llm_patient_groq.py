@@ -4,13 +4,18 @@
 # ============================================
 
 import os
-import json
 import random
-import re
-import asyncio
-import requests
+from functools import lru_cache
 from dotenv import load_dotenv
-from runner.runner_globals import PATIENT_MEMORY, SESSION_LOG
+from engine.groq_client import get_groq_client
+from engine.llm_scheduler import SchedulerBusy, PRIORITY_LIVE, PRIORITY_FEEDBACK
+from engine.model_router import MODEL_ROUTER, ROUTE_PATIENT, ROUTE_EXAMINER
+from engine.response_cleaner import clean_text, clean_stream
+from engine.reply_cache import REPLY_CACHE
+from engine.intent_router import INTENT_ROUTER
+from runner.session_state import Session, PatientMemory, get_session
+from runner.case_model import Case, as_case
+from runner.risk_factors import get_risk_factor_store
 
 
 # ============================================
@@ -25,80 +30,124 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # ============================================
 
 def clean_response(text: str) -> str:
+    # Same precompiled rules the streaming path applies delta by delta
     if not isinstance(text, str):
         return "Sorry doctor, I didn’t understand that."
-    text = re.sub(r"\*.*?\*", "", text)
-    text = re.sub(r"\.{2,}", ".", text)
-    text = re.sub(r"\b(sighs|gulps|uh|um)[^\.!?]*[\.!?]?", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\b([A-Za-z])-([A-Za-z]+)\b", r"\2", text)
-    text = re.sub(r'\s{2,}', ' ', text).strip()
-    return text
+    return clean_text(text)
 
 # ============================================
 # 🗣️ Core LLM Function
 # ============================================
 
-def generate_reply(prompt: str, model: str = "llama3-70b-8192") -> str:
+PATIENT_SYSTEM_PROMPT = "You are a simulated patient in a UKMLA OSCE exam."
+FALLBACK_REPLY = "Sorry doctor, I’m not sure how to respond to that."
+
+
+def _patient_messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": PATIENT_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def generate_reply_messages(messages: list, model: str | None = None,
+                            priority: int = PRIORITY_LIVE) -> str:
+    try:
+        content = get_groq_client().chat_sync(
+            messages, model or MODEL_ROUTER.pick(ROUTE_PATIENT), temperature=0.6, max_tokens=300, priority=priority)
+        return clean_response(content)
+    except Exception as e:
+        print(f"⚠️ generate_reply error: {e}")
+        return FALLBACK_REPLY
+
+
+async def generate_reply_messages_async(messages: list, model: str | None = None,
+                                        priority: int = PRIORITY_LIVE) -> str:
     try:
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        payload = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": "You are a simulated patient in a UKMLA OSCE exam."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.6,
-            "max_tokens": 300
-        }
-        response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=payload)
-        response.raise_for_status()
-        content = response.json()['choices'][0]['message']['content']
+        content = await get_groq_client().chat(
+            messages, model or MODEL_ROUTER.pick(ROUTE_PATIENT), temperature=0.6, max_tokens=300, priority=priority)
         return clean_response(content)
+    except SchedulerBusy:
+        raise   # surfaced to the client as 429 + Retry-After
     except Exception as e:
         print(f"⚠️ generate_reply error: {e}")
-        return "Sorry doctor, I’m not sure how to respond to that."
+        return FALLBACK_REPLY
+
+
+async def generate_reply_messages_stream(messages: list, model: str | None = None):
+    """
+    Yields raw content deltas from Groq's streaming endpoint.
+    If the call fails before anything was sent, yields the fallback line;
+    a failure after that is re-raised, so callers never mistake a cut-off
+    reply for a complete one.
+    """
+    sent = False
+    try:
+        async for delta in get_groq_client().chat_stream(
+                messages, model or MODEL_ROUTER.pick(ROUTE_PATIENT), temperature=0.6, max_tokens=300):
+            sent = True
+            yield delta
+    except SchedulerBusy:
+        raise   # surfaced to the client as 429 + Retry-After
+    except Exception as e:
+        print(f"⚠️ generate_reply_stream error: {e}")
+        if sent:
+            raise
+        yield FALLBACK_REPLY
+
+
+def generate_reply(prompt: str, model: str | None = None, priority: int = PRIORITY_LIVE) -> str:
+    return generate_reply_messages(_patient_messages(prompt), model, priority)
+
+
+async def generate_reply_async(prompt: str, model: str | None = None,
+                               priority: int = PRIORITY_LIVE) -> str:
+    return await generate_reply_messages_async(_patient_messages(prompt), model, priority)
+
+
+async def generate_reply_stream(prompt: str, model: str | None = None):
+    async for delta in generate_reply_messages_stream(_patient_messages(prompt), model):
+        yield delta
 
 # ============================================
 # 🧬 FAMILY HISTORY LOGIC
 # ============================================
 
 def get_family_history_reply(station_id: str, diagnosis: str, station_type="history") -> str:
-    try:
-        if station_type == "counselling":
-            return f"My {random.choice(['mother', 'father'])} also had {diagnosis}."
-        path = os.path.join("data", "risk_factors", f"{station_id}.json")
-        with open(path, "r") as f:
-            data = json.load(f)
-        relevant = data.get("family_relevant", [])
-        distractors = data.get("family_distractors", [])
-        options = relevant + distractors
-        return random.choice(options) if options else "Not sure about family history, doctor."
-    except Exception as e:
-        print(f"⚠️ Family history load error: {e}")
+    # Served from the preloaded risk factor store — no file I/O, safe to
+    # call directly inside the event loop
+    if station_type == "counselling":
+        return f"My {random.choice(['mother', 'father'])} also had {diagnosis}."
+    entry = get_risk_factor_store().get(station_id)
+    if entry is None or not entry.options:
         return "Not sure about family history, doctor."
+    return random.choice(entry.options)
 
 # ============================================
 # 👨‍⚕️ PATIENT REPLY GENERATOR
 # ============================================
 
-def get_patient_reply(user_input: str, case: dict, phase: str) -> str:
-    name = case.get("name", "the patient")
-    age = case.get("age", "40")
-    symptoms = case.get("symptoms", [])
-    mood = PATIENT_MEMORY.get("patient_mood", "neutral")
-    concern = case.get("presenting_complaint", "some issue")
+def build_patient_prefix(case: Case) -> str:
+    """
+    Static persona prompt for one case. Built once and reused as the
+    byte-identical system message on every turn, so OpenAI-compatible
+    providers can serve it from their prompt-prefix cache.
+
+    Cached on case id + the fields it is built from, not on the Case
+    object: rebuilt Cases (dict callers, hot reloads) hit the same entry
+    and no stale Case is kept alive.
+    """
+    return _patient_prefix(case.case_id, case.name, case.age, case.symptoms_text,
+                           case.concern_text, case.patient_facts)
 
-    social = case.get("social_history", {})
-    family = case.get("family_history", [])
 
-    prompt = f"""
+@lru_cache(maxsize=256)
+def _patient_prefix(case_id: str, name: str, age, symptoms_text: str,
+                    concern_text: str, patient_facts: str) -> str:
+    return f"""{PATIENT_SYSTEM_PROMPT}
 You are {name}, a {age}-year-old UKMLA patient.
-Your symptoms are: {symptoms}
-Your mood is: {mood}
-Your concern today is: {concern}
+Your symptoms are: {symptoms_text}
+Your concern today is: {concern_text}
 
 Do not repeat previously said symptoms unless asked again.
 
@@ -108,42 +157,127 @@ Respond naturally and briefly:
 - Don’t list red flags unless clearly asked
 
 Only mention:
-• Smoking: {social.get('smoking', 'N/A')}
-• Alcohol: {social.get('alcohol', 'N/A')}
-• Diet: {social.get('diet', 'N/A')}
-• Exercise: {social.get('exercise', 'N/A')}
-• Family History: {', '.join(family) or 'None known'}
-
-🧑‍⚕️ Doctor said: “{user_input}”
-Now reply as the patient:
+{patient_facts}
 """
-    return generate_reply(prompt)
+
+
+def build_patient_turn(user_input: str, mood: str, recap: str = "") -> str:
+    """Small per-turn suffix: everything that changes between turns."""
+    recap = f"{recap}\n" if recap else ""
+    return f"{recap}Your mood is: {mood}\n🧑‍⚕️ Doctor said: “{user_input}”\nNow reply as the patient:"
+
+
+def patient_memory(session: Session | None = None) -> PatientMemory:
+    """Memory of the given session (the default session for scripts)."""
+    return (session or get_session()).memory
+
+
+def build_patient_messages(user_input: str, case, phase: str, session: Session | None = None) -> list:
+    """
+    System prefix → recent turns verbatim → per-turn suffix (which
+    carries the rolling summary of older turns and disclosed facts).
+    """
+    case = as_case(case)
+    memory = patient_memory(session)
+    conversation = memory.conversation
+    return [
+        {"role": "system", "content": build_patient_prefix(case)},
+        *conversation.history_messages(),
+        {"role": "user", "content": build_patient_turn(user_input, memory.patient_mood, conversation.recap())}
+    ]
+
+
+def _record_turn(user_input: str, case, reply: str, session: Session | None):
+    if reply and reply != FALLBACK_REPLY:
+        patient_memory(session).conversation.add_turn(user_input, reply, as_case(case).symptoms)
+
+
+def _reply_cache_key(user_input: str, case, phase: str, session: Session | None) -> tuple:
+    # The prompt carries this session's history + recap, so the key must too
+    memory = patient_memory(session)
+    return REPLY_CACHE.make_key(
+        as_case(case).case_id, user_input, memory.patient_mood, phase, memory.conversation.digest())
+
+
+def _remember_reply(key: tuple, reply: str):
+    # Never cache the canned error line
+    if reply and reply != FALLBACK_REPLY:
+        REPLY_CACHE.put(key, reply)
+
+
+def answer_locally(user_input: str, case) -> str | None:
+    """Intent fast-path: answers structured questions from the case JSON."""
+    return INTENT_ROUTER.answer(user_input, as_case(case), get_family_history_reply)
+
+
+def get_patient_reply(user_input: str, case, phase: str, session: Session | None = None) -> str:
+    reply = answer_locally(user_input, case)
+    if reply is None:
+        key = _reply_cache_key(user_input, case, phase, session)
+        reply = REPLY_CACHE.get(key)
+        if reply is None:
+            reply = generate_reply_messages(build_patient_messages(user_input, case, phase, session))
+            _remember_reply(key, reply)
+    _record_turn(user_input, case, reply, session)
+    return reply
 
 # ============================================
 # ⚡️ Async Version for FastAPI
+# Awaits the pooled client directly — no executor thread per turn
 # ============================================
 
-async def get_patient_reply_async(user_input, case, phase):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_patient_reply, user_input, case, phase)
+async def get_patient_reply_async(user_input, case, phase, session: Session | None = None):
+    reply = answer_locally(user_input, case)
+    if reply is None:
+        key = _reply_cache_key(user_input, case, phase, session)
+        reply = REPLY_CACHE.get(key)
+        if reply is None:
+            reply = await generate_reply_messages_async(build_patient_messages(user_input, case, phase, session))
+            _remember_reply(key, reply)
+    _record_turn(user_input, case, reply, session)
+    return reply
+
+
+async def get_patient_reply_stream(user_input, case, phase, session: Session | None = None):
+    """Streams the patient reply chunk by chunk (time-to-first-token)."""
+    reply = answer_locally(user_input, case)
+    if reply is None:
+        key = _reply_cache_key(user_input, case, phase, session)
+        reply = REPLY_CACHE.get(key)
+    if reply is not None:
+        _record_turn(user_input, case, reply, session)
+        yield reply
+        return
+
+    # Deltas are cleaned as they stream, so client and TTS never see
+    # stage directions or stutters
+    parts = []
+    try:
+        async for delta in clean_stream(
+                generate_reply_messages_stream(build_patient_messages(user_input, case, phase, session))):
+            parts.append(delta)
+            yield delta
+    except SchedulerBusy:
+        raise
+    except Exception as e:
+        # Cut off mid-reply: the client keeps what it got, but the partial
+        # text is never cached or remembered as the patient's answer
+        print(f"⚠️ Patient reply stream interrupted: {e}")
+        return
+    reply = "".join(parts)
+    _remember_reply(key, reply)
+    _record_turn(user_input, case, reply, session)
 
 # ============================================
 # 📝 EXAMINER FEEDBACK GENERATOR
 # ============================================
 
-def generate_examiner_comment(log: dict, case: dict) -> str:
-    try:
-        prompt = f"""
+def build_examiner_prompt(log: dict, case) -> str:
+    case = as_case(case)
+    return f"""
 You are a UKMLA examiner. Provide structured feedback.
 
-CASE: {case.get('station_name', 'unknown')}
-DIAGNOSIS: {case.get('diagnosis')}
-SYMPTOMS: {case.get('symptoms')}
-RED FLAGS: {case.get('red_flags')}
-ICE: {case.get('ice')}
-PMH: {case.get('medical_history')}
-FHx: {case.get('family_history')}
-SHx: {case.get('social_history')}
+{case.examiner_case_summary}
 
 QUESTIONS: {log.get('questions')}
 DUPLICATES: {log.get('duplicate_questions')}
@@ -158,7 +292,23 @@ Return your feedback in 7 points:
 6. Safety Netting
 7. Improvement Tip
 """
-        return generate_reply(prompt)
+
+
+def generate_examiner_comment(log: dict, case) -> str:
+    try:
+        return generate_reply(build_examiner_prompt(log, case),
+                              model=MODEL_ROUTER.pick(ROUTE_EXAMINER), priority=PRIORITY_FEEDBACK)
+    except Exception as e:
+        print("⚠️ Examiner feedback failed:", e)
+        return "⚠️ Feedback unavailable."
+
+
+async def generate_examiner_comment_async(log: dict, case) -> str:
+    try:
+        return await generate_reply_async(build_examiner_prompt(log, case),
+                                          model=MODEL_ROUTER.pick(ROUTE_EXAMINER), priority=PRIORITY_FEEDBACK)
+    except SchedulerBusy:
+        raise
     except Exception as e:
         print("⚠️ Examiner feedback failed:", e)
         return "⚠️ Feedback unavailable."
@@ -0,0 +1,253 @@
+# ============================================
+# 🚦 LLM REQUEST SCHEDULER
+# Shares the Groq quota between live patient turns, examiner feedback
+# and batch work: RPM + TPM token buckets, strict priority queue,
+# and early 429s when the queue is too deep
+# ============================================
+
+import os
+import math
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from collections import Counter
+
+# ============================================
+# ⚙️ Settings
+# ============================================
+
+GROQ_RPM = float(os.getenv("GROQ_RPM", "30"))          # requests per minute, 0 = unlimited
+GROQ_TPM = float(os.getenv("GROQ_TPM", "6000"))        # tokens per minute, 0 = unlimited
+GROQ_MAX_QUEUE = int(os.getenv("GROQ_MAX_QUEUE", "64"))
+
+PRIORITY_LIVE = 0       # patient turns — someone is waiting to hear the reply
+PRIORITY_FEEDBACK = 1   # end-of-station examiner reports
+PRIORITY_BATCH = 2      # analytics, replays, offline jobs
+
+PRIORITY_NAMES = {PRIORITY_LIVE: "live", PRIORITY_FEEDBACK: "feedback", PRIORITY_BATCH: "batch"}
+
+OUTRANKED_POLL = 0.05   # seconds between checks while a more urgent call waits
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_cost(messages: list, max_tokens: int) -> int:
+    """Rough token cost: prompt chars/4 + the completion budget."""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // CHARS_PER_TOKEN + max_tokens
+
+
+class SchedulerBusy(RuntimeError):
+    """Queue too deep; the caller should answer 429 with Retry-After."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"LLM queue is full, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+# ============================================
+# 🪣 Token Bucket
+# ============================================
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute up to one minute of burst."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self.level -= min(amount, self.capacity)
+
+# ============================================
+# 🚦 SCHEDULER
+# ============================================
+
+
+class _Waiter:
+    __slots__ = ("priority", "cost", "future")
+
+    def __init__(self, priority: int, cost: int, future):
+        self.priority = priority
+        self.cost = cost
+        self.future = future
+
+
+class LLMScheduler:
+    """
+    Admits Groq calls in (priority, arrival) order once both buckets
+    have room. The head of the queue blocks everyone behind it, so a
+    waiting live turn is never overtaken by feedback or batch work.
+
+    Blocking callers (acquire_sync) take from the same buckets and do
+    not join the async queue, but neither side admits a call while a
+    more urgent one of the other kind is waiting. Retries and hedges of
+    an admitted call are charged to the buckets with charge().
+    """
+
+    def __init__(self, rpm: float = GROQ_RPM, tpm: float = GROQ_TPM, max_queue: int = GROQ_MAX_QUEUE):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_queue = max_queue
+        self._queue = []   # heap of (priority, seq, _Waiter)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._timer = None
+        self._sync_waiting = Counter()   # priority -> blocked acquire_sync callers
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.rejected = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.wait_total = 0.0
+        self.charged = 0
+
+    def _wait_for(self, requests: int, tokens: int, now: float) -> float:
+        return max(self.requests.wait_time(requests, now), self.tokens.wait_time(tokens, now))
+
+    def _outranked(self, priority: int) -> bool:
+        """A more urgent call (async or blocking) is waiting; hold _lock."""
+        if any(p < priority for p, n in self._sync_waiting.items() if n):
+            return True
+        return any(w.priority < priority for _, _, w in list(self._queue) if not w.future.done())
+
+    # ----------------------------------------
+    # 🚪 Admission
+    # ----------------------------------------
+
+    def admit(self, priority: int = PRIORITY_LIVE, cost: int = 0):
+        """
+        Raises SchedulerBusy if a request of this priority would queue
+        behind more than max_queue others. Cheap enough for route handlers
+        to call before they start a streamed response.
+        """
+        ahead = [w for _, _, w in self._queue if w.priority <= priority and not w.future.done()]
+        if len(ahead) < self.max_queue:
+            return
+        with self._lock:
+            wait = self._wait_for(len(ahead) + 1, sum(w.cost for w in ahead) + cost, time.monotonic())
+        self.rejected[PRIORITY_NAMES.get(priority, "batch")] += 1
+        raise SchedulerBusy(max(1.0, math.ceil(wait)))
+
+    def _busy(self, priority: int, cost: int) -> SchedulerBusy:
+        with self._lock:
+            wait = self._wait_for(1, cost, time.monotonic())
+        self.rejected[PRIORITY_NAMES.get(priority, "batch")] += 1
+        return SchedulerBusy(max(1.0, math.ceil(wait)))
+
+    async def acquire(self, priority: int = PRIORITY_LIVE, cost: int = 0, timeout: float | None = None):
+        """
+        Waits until this request may be sent upstream.
+
+        Raises:
+            SchedulerBusy: Queue too deep, or not admitted within timeout seconds
+        """
+        self.admit(priority, cost)
+        started = time.monotonic()
+        waiter = _Waiter(priority, cost, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, (priority, next(self._seq), waiter))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except asyncio.TimeoutError:
+            self._dispatch()   # it may have been the head everyone else waited behind
+            raise self._busy(priority, cost) from None
+        self.wait_total += time.monotonic() - started
+        self.admitted[PRIORITY_NAMES.get(priority, "batch")] += 1
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            _, _, head = self._queue[0]
+            if head.future.done():   # caller went away while queued
+                heapq.heappop(self._queue)
+                continue
+            with self._lock:
+                if self._outranked(head.priority):
+                    wait = OUTRANKED_POLL
+                else:
+                    wait = self._wait_for(1, head.cost, time.monotonic())
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(head.cost)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            head.future.set_result(None)
+
+    def acquire_sync(self, priority: int = PRIORITY_LIVE, cost: int = 0, timeout: float | None = None):
+        """Blocking variant for non-async scripts; yields to more urgent waiters."""
+        started = time.monotonic()
+        with self._lock:
+            self._sync_waiting[priority] += 1
+        try:
+            while True:
+                with self._lock:
+                    if self._outranked(priority):
+                        wait = OUTRANKED_POLL
+                    else:
+                        wait = self._wait_for(1, cost, time.monotonic())
+                        if wait <= 0:
+                            self.requests.take(1)
+                            self.tokens.take(cost)
+                            break
+                if timeout is not None and time.monotonic() + wait - started > timeout:
+                    raise self._busy(priority, cost)
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._sync_waiting[priority] -= 1
+        self.wait_total += time.monotonic() - started
+        self.admitted[PRIORITY_NAMES.get(priority, "batch")] += 1
+
+    def charge(self, cost: int = 0):
+        """
+        Bills one more upstream request (a retry or hedge of an admitted
+        call) without waiting; the buckets may go negative, which holds
+        back the next admissions instead.
+        """
+        with self._lock:
+            now = time.monotonic()
+            for bucket, amount in ((self.requests, 1), (self.tokens, cost)):
+                bucket.wait_time(amount, now)   # refill up to now before going below zero
+                bucket.take(amount)
+        self.charged += 1
+
+    def stats(self) -> dict:
+        admitted = sum(self.admitted.values())
+        return {
+            "queued": sum(1 for _, _, w in self._queue if not w.future.done()),
+            "max_queue": self.max_queue,
+            "rpm": self.requests.capacity,
+            "tpm": self.tokens.capacity,
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+            "charged_retries": self.charged,
+            "avg_wait_ms": round(self.wait_total / admitted * 1000, 1) if admitted else 0.0,
+        }
+
+# ============================================
+# 🌍 Shared Scheduler
+# ============================================
+
+LLM_SCHEDULER = LLMScheduler()
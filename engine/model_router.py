@@ -0,0 +1,172 @@
+# ============================================
+# 🧭 LATENCY-AWARE MODEL ROUTER
+# Short patient turns → small fast model, examiner reports → large model;
+# falls back to the next model when one's rolling p95 or error rate
+# crosses its threshold
+# ============================================
+
+import os
+import time
+import threading
+from collections import deque
+
+# ============================================
+# ⚙️ Routing Settings
+# ============================================
+
+GROQ_FAST_MODEL = os.getenv("GROQ_FAST_MODEL", "llama3-8b-8192")
+GROQ_LARGE_MODEL = os.getenv("GROQ_LARGE_MODEL", "llama3-70b-8192")
+
+ROUTE_PATIENT = "patient"
+ROUTE_EXAMINER = "examiner"
+
+# What a latency sample measures: streams report time to first token,
+# plain calls the whole completion. Each kind has its own window
+LATENCY_FIRST_TOKEN = "first_token"
+LATENCY_TOTAL = "total"
+
+# Models in order of preference, plus the p95 (seconds) of the given
+# latency kind a model may reach before the route moves on to the next one
+ROUTES = {
+    ROUTE_PATIENT: {
+        "models": (GROQ_FAST_MODEL, GROQ_LARGE_MODEL),
+        "latency": LATENCY_FIRST_TOKEN,
+        "max_p95": float(os.getenv("GROQ_PATIENT_MAX_P95", "3")),
+    },
+    ROUTE_EXAMINER: {
+        "models": (GROQ_LARGE_MODEL, GROQ_FAST_MODEL),
+        "latency": LATENCY_TOTAL,
+        "max_p95": float(os.getenv("GROQ_EXAMINER_MAX_P95", "20")),
+    },
+}
+
+MAX_ERROR_RATE = float(os.getenv("GROQ_ROUTE_MAX_ERROR_RATE", "0.25"))
+STATS_WINDOW = float(os.getenv("GROQ_ROUTE_WINDOW", "120"))   # seconds of history
+MIN_SAMPLES = 8
+MAX_SAMPLES = 500
+
+# ============================================
+# 📊 Per-Model Stats
+# ============================================
+
+
+class _ModelStats:
+    """Time-windowed (timestamp, seconds, ok) samples for one model and latency kind."""
+
+    __slots__ = ("samples", "calls", "errors")
+
+    def __init__(self):
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.calls = 0
+        self.errors = 0
+
+    def recent(self, now: float):
+        # Old samples age out, so a model that was skipped gets retried
+        # once its bad window has passed
+        while self.samples and now - self.samples[0][0] > STATS_WINDOW:
+            self.samples.popleft()
+        return self.samples
+
+    def p95(self, now: float) -> float | None:
+        latencies = sorted(s for _, s, ok in self.recent(now) if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+# ============================================
+# 🧭 MODEL ROUTER
+# ============================================
+
+
+class ModelRouter:
+    """
+    Picks a model per request class and learns from recorded outcomes.
+
+    GroqClient records every upstream call; call sites only ask
+    pick(ROUTE_PATIENT) / pick(ROUTE_EXAMINER). A route judges latency
+    on its own kind of samples only (long examiner completions do not
+    count against a model's patient time-to-first-token), and errors
+    across all of a model's calls.
+    """
+
+    def __init__(self, routes: dict = ROUTES, max_error_rate: float = MAX_ERROR_RATE):
+        self.routes = routes
+        self.max_error_rate = max_error_rate
+        self._models = {}   # model -> {latency kind -> _ModelStats}
+        self._lock = threading.Lock()
+        self.fallbacks = {name: 0 for name in routes}
+
+    def _stats(self, model: str, kind: str) -> _ModelStats:
+        kinds = self._models.setdefault(model, {})
+        stats = kinds.get(kind)
+        if stats is None:
+            stats = kinds[kind] = _ModelStats()
+        return stats
+
+    def _error_rate(self, model: str, now: float) -> tuple:
+        """(samples, error rate) over every kind of call to the model."""
+        samples = errors = 0
+        for stats in self._models.get(model, {}).values():
+            recent = stats.recent(now)
+            samples += len(recent)
+            errors += sum(1 for _, _, ok in recent if not ok)
+        return samples, errors / samples if samples else 0.0
+
+    def healthy(self, model: str, max_p95: float, kind: str = LATENCY_TOTAL, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            samples, error_rate = self._error_rate(model, now)
+            if samples >= MIN_SAMPLES and error_rate > self.max_error_rate:
+                return False
+            stats = self._stats(model, kind)
+            if len(stats.recent(now)) < MIN_SAMPLES:
+                return True
+            p95 = stats.p95(now)
+            return p95 is None or p95 <= max_p95
+
+    def pick(self, route: str) -> str:
+        """First healthy model for the route (the primary if none are)."""
+        config = self.routes[route]
+        models = config["models"]
+        now = time.monotonic()
+        for model in models:
+            if self.healthy(model, config["max_p95"], config["latency"], now):
+                if model != models[0]:
+                    self.fallbacks[route] += 1
+                return model
+        return models[0]
+
+    def record(self, model: str, seconds: float, ok: bool, kind: str = LATENCY_TOTAL):
+        with self._lock:
+            stats = self._stats(model, kind)
+            stats.samples.append((time.monotonic(), seconds, ok))
+            stats.calls += 1
+            if not ok:
+                stats.errors += 1
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            models = {}
+            for model, kinds in self._models.items():
+                samples, error_rate = self._error_rate(model, now)
+                p95s = {kind: stats.p95(now) for kind, stats in kinds.items()}
+                models[model] = {
+                    "calls": sum(stats.calls for stats in kinds.values()),
+                    "errors": sum(stats.errors for stats in kinds.values()),
+                    "window_samples": samples,
+                    "window_error_rate": round(error_rate, 4),
+                    "window_p95_ms": {kind: round(p95 * 1000, 1) if p95 is not None else None
+                                      for kind, p95 in p95s.items()},
+                }
+        return {
+            "routes": {name: list(cfg["models"]) for name, cfg in self.routes.items()},
+            "fallbacks": dict(self.fallbacks),
+            "models": models,
+        }
+
+# ============================================
+# 🌍 Shared Router
+# ============================================
+
+MODEL_ROUTER = ModelRouter()
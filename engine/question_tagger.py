@@ -0,0 +1,131 @@
+# ============================================
+# 🏷️ QUESTION TAGGER
+# Tags doctor questions with examiner domains (data gathering, ICE,
+# management) from keyword sets in data/question_tags.json, compiled
+# into one word-boundary alternation regex: one pass per utterance,
+# one pass over a whole batch of transcripts
+# ============================================
+
+import os
+import re
+import json
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+
+# ============================================
+# ⚙️ Tagger Settings
+# ============================================
+
+QUESTION_TAGS_PATH = os.getenv("UKMLA_QUESTION_TAGS", "data/question_tags.json")
+
+_NO_TAGS = frozenset()
+
+# ============================================
+# 🧩 Keyword Compilation
+# ============================================
+
+
+def _keyword_body(keyword: str) -> str:
+    """
+    "allerg*" → prefix match; anything else must end on a word boundary.
+    Words in a phrase may be separated by any run of spaces/tabs (never a
+    newline, so batch matches cannot cross transcripts).
+    """
+    prefix = keyword.endswith("*")
+    words = keyword.rstrip("*").lower().split()
+    body = r"[ \t]+".join(re.escape(w) for w in words)
+    return body if prefix else body + r"\b"
+
+
+def _normalize(matched: str) -> str:
+    return " ".join(matched.split())
+
+
+class QuestionTagger:
+    """
+    Multi-pattern domain tagger.
+
+    Each keyword maps to the (domain, tag) pairs it signals. A keyword
+    that contains another ("painkiller" ⊃ "pain*") also carries the inner
+    keyword's tags, so the single leftmost-longest match per position
+    tags exactly what a separate scan per keyword would.
+
+    Args:
+        tag_sets (dict): {domain: {tag: [keyword, ...]}}
+    """
+
+    def __init__(self, tag_sets: dict):
+        keyword_tags = {}   # keyword stem -> set of (domain, tag)
+        bodies = {}         # keyword stem -> regex body
+        for domain, tags in tag_sets.items():
+            if domain.startswith("_"):
+                continue
+            for tag, keywords in tags.items():
+                for keyword in keywords:
+                    stem = _normalize(keyword.rstrip("*").lower())
+                    keyword_tags.setdefault(stem, set()).add((domain, tag))
+                    bodies[stem] = _keyword_body(keyword)
+
+        singles = {stem: re.compile(r"\b" + body) for stem, body in bodies.items()}
+        self._tags = {}
+        for stem in keyword_tags:
+            merged = set()
+            for other, pattern in singles.items():
+                if pattern.search(stem):
+                    merged |= keyword_tags[other]
+            self._tags[stem] = frozenset(merged)
+
+        ordered = sorted(bodies.values(), key=len, reverse=True)
+        self._pattern = re.compile(r"\b(?:" + "|".join(ordered) + ")")
+        self.domains = tuple(d for d in tag_sets if not d.startswith("_"))
+
+    @classmethod
+    def from_file(cls, path: str = QUESTION_TAGS_PATH) -> "QuestionTagger":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    # ----------------------------------------
+    # 🔎 One Utterance
+    # ----------------------------------------
+
+    def tag(self, text: str) -> frozenset:
+        """Returns the {(domain, tag), ...} pairs one utterance signals."""
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            found |= self._tags[_normalize(match.group())]
+        return frozenset(found) if found else _NO_TAGS
+
+    # ----------------------------------------
+    # 📦 Batch (analytics)
+    # ----------------------------------------
+
+    def tag_many(self, texts) -> list:
+        """
+        Tags many transcripts in one regex pass over their newline-joined
+        text; returns one frozenset per input, in order.
+        """
+        texts = [t.lower() for t in texts]
+        if not texts:
+            return []
+        starts = [0, *accumulate(len(t) + 1 for t in texts[:-1])]
+        found = [set() for _ in texts]
+        for match in self._pattern.finditer("\n".join(texts)):
+            found[bisect_right(starts, match.start()) - 1] |= self._tags[_normalize(match.group())]
+        return [frozenset(f) if f else _NO_TAGS for f in found]
+
+    def count(self, texts) -> Counter:
+        """How many transcripts signal each (domain, tag) pair."""
+        counts = Counter()
+        for tags in self.tag_many(texts):
+            counts.update(tags)
+        return counts
+
+# ============================================
+# 🌍 Shared Tagger
+# ============================================
+
+QUESTION_TAGGER = QuestionTagger.from_file()
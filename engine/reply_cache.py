@@ -0,0 +1,135 @@
+# ============================================
+# 🗃️ PATIENT REPLY CACHE
+# LRU + TTL cache of patient replies keyed by
+# (case id, normalized doctor question, mood, phase, conversation digest)
+# ============================================
+
+import os
+import re
+import time
+import random
+import threading
+from collections import OrderedDict
+
+# ============================================
+# ⚙️ Cache Settings
+# ============================================
+
+REPLY_CACHE_SIZE = int(os.getenv("UKMLA_REPLY_CACHE_SIZE", "2048"))       # 0 disables
+REPLY_CACHE_TTL = float(os.getenv("UKMLA_REPLY_CACHE_TTL", "3600"))       # seconds
+REPLY_CACHE_VARIANTS = int(os.getenv("UKMLA_REPLY_CACHE_VARIANTS", "1"))  # replies kept per key
+
+_PUNCTUATION = re.compile(r"[^\w\s']+")
+_FILLERS = {"um", "uh", "erm", "so", "okay", "ok", "right", "well", "please", "just", "and"}
+
+
+def normalize_question(text: str) -> str:
+    """
+    Folds STT noise so near-identical questions share a key:
+    "Um, do you SMOKE?" -> "do you smoke"
+    """
+    words = _PUNCTUATION.sub(" ", text.lower()).split()
+    while words and words[0] in _FILLERS:
+        words.pop(0)
+    return " ".join(words)
+
+# ============================================
+# 🗃️ REPLY CACHE
+# ============================================
+
+
+class _CacheEntry:
+    __slots__ = ("replies", "expires_at")
+
+    def __init__(self, expires_at: float):
+        self.replies = []
+        self.expires_at = expires_at
+
+
+class ReplyCache:
+    """
+    Bounded reply cache.
+
+    With variants > 1 a key only starts serving hits once it has
+    collected that many different replies; hits then pick one at random
+    so repeated questions don't get a word-for-word identical answer.
+
+    Args:
+        max_entries (int): Key cap; least recently used keys are evicted
+        ttl (float): Seconds a key lives after its first reply was stored
+        variants (int): Replies pooled per key
+    """
+
+    def __init__(self, max_entries: int = REPLY_CACHE_SIZE, ttl: float = REPLY_CACHE_TTL,
+                 variants: int = REPLY_CACHE_VARIANTS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variants = max(1, variants)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(case_id: str, question: str, mood: str, phase: str, context: str = "") -> tuple:
+        """context: digest of the conversation so far ("" at the start of a station)."""
+        return (case_id, normalize_question(question), mood or "neutral", phase or "", context)
+
+    def get(self, key: tuple) -> str | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None or len(entry.replies) < self.variants:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return random.choice(entry.replies)
+
+    def put(self, key: tuple, reply: str):
+        if not self.enabled or not reply:
+            return
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                entry = _CacheEntry(now + self.ttl)
+                self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if reply not in entry.replies and len(entry.replies) < self.variants:
+                entry.replies.append(reply)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "variants": self.variants,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+# ============================================
+# 🌍 Shared Cache
+# ============================================
+
+REPLY_CACHE = ReplyCache()
@@ -0,0 +1,355 @@
+# ============================================
+# 🛡️ LLM CALL RESILIENCE
+# Per-attempt timeouts, jittered retries (429/5xx, honoring Retry-After),
+# hedged second requests after the observed p95, and a circuit breaker
+# that fails fast while Groq is down
+# ============================================
+
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+import httpx
+
+# ============================================
+# ⚙️ Settings
+# ============================================
+
+GROQ_ATTEMPT_TIMEOUT = float(os.getenv("GROQ_ATTEMPT_TIMEOUT", "15"))   # seconds per attempt
+GROQ_DEADLINE = float(os.getenv("GROQ_DEADLINE", "30"))                 # seconds across all attempts
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+GROQ_RETRY_BASE = float(os.getenv("GROQ_RETRY_BASE", "0.25"))
+GROQ_RETRY_MAX = float(os.getenv("GROQ_RETRY_MAX", "4"))
+GROQ_HEDGE = os.getenv("GROQ_HEDGE", "1") != "0"
+GROQ_HEDGE_BUDGET = float(os.getenv("GROQ_HEDGE_BUDGET", "0.1"))        # max share of calls hedged
+GROQ_BREAKER_FAILURES = int(os.getenv("GROQ_BREAKER_FAILURES", "5"))
+GROQ_BREAKER_RESET = float(os.getenv("GROQ_BREAKER_RESET", "30"))
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling Groq while the breaker is open."""
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    value = error.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# ============================================
+# ⏱️ Rolling Latency
+# ============================================
+
+
+class LatencyWindow:
+    """
+    Last N successful latencies for one class of call; its p95 drives
+    the hedge delay. Streams record time-to-first-token, plain calls the
+    whole request.
+    """
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# ============================================
+# 🔌 Circuit Breaker
+# ============================================
+
+
+class CircuitBreaker:
+    """
+    closed → open after N consecutive failures → half-open after the
+    reset timeout (one probe call) → closed on success / open on failure.
+    """
+
+    def __init__(self, failures: int = GROQ_BREAKER_FAILURES, reset_after: float = GROQ_BREAKER_RESET):
+        self.failure_threshold = failures
+        self.reset_after = reset_after
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state, self._probing = "half_open", False
+            if self.state == "closed":
+                return
+            # A probe that never reported back (cancelled) expires after reset_after
+            now = time.monotonic()
+            if self.state == "half_open" and (not self._probing or now - self._probe_at >= self.reset_after):
+                self._probing, self._probe_at = True, now
+                return
+            self.rejected += 1
+        raise CircuitOpenError("Groq circuit breaker is open")
+
+    def record_success(self):
+        with self._lock:
+            self.state, self.failures, self._probing = "closed", 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state, self.opened_at, self._probing = "open", time.monotonic(), False
+
+# ============================================
+# 🛡️ RESILIENT CALLER
+# ============================================
+
+
+class Resilience:
+    """
+    Wraps one upstream call function with retries, hedging and the breaker.
+
+    Call functions take a per-attempt timeout (seconds) and do one request.
+    Each call names a latency window ("call" or "stream") so hedge delays
+    come from comparable calls only. GroqClient keeps one per model.
+    """
+
+    def __init__(self, attempt_timeout: float = GROQ_ATTEMPT_TIMEOUT, deadline: float = GROQ_DEADLINE,
+                 max_retries: int = GROQ_MAX_RETRIES, hedge: bool = GROQ_HEDGE,
+                 hedge_budget: float = GROQ_HEDGE_BUDGET):
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_budget = hedge_budget
+        self.breaker = CircuitBreaker()
+        self.latency = {}   # window key -> LatencyWindow
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.failures = 0
+
+    # ----------------------------------------
+    # 🔁 Backoff
+    # ----------------------------------------
+
+    def _backoff(self, attempt: int, error: Exception, remaining: float) -> float | None:
+        """Delay before the next attempt, or None to give up."""
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+        delay = retry_after(error)
+        if delay is None:
+            # Full jitter keeps synchronized clients from retrying in lockstep
+            delay = random.uniform(0, min(GROQ_RETRY_MAX, GROQ_RETRY_BASE * 2 ** attempt))
+        return delay if delay < remaining else None
+
+    def _attempt_timeout(self, started: float, deadline: float) -> float:
+        return max(0.1, min(self.attempt_timeout, deadline - (time.monotonic() - started)))
+
+    def _window(self, key: str) -> LatencyWindow:
+        window = self.latency.get(key)
+        if window is None:
+            window = self.latency.setdefault(key, LatencyWindow())
+        return window
+
+    def _hedge_delay(self, key: str) -> float | None:
+        window = self.latency.get(key)
+        if not self.hedge or window is None or len(window) < MIN_HEDGE_SAMPLES:
+            return None
+        if self.hedges >= self.hedge_budget * self.calls:
+            return None
+        return window.percentile(0.95)
+
+    def _succeeded(self, key: str, seconds: float | None):
+        if seconds is not None:
+            self._window(key).add(seconds)
+        self.breaker.record_success()
+
+    def _failed(self, error: Exception):
+        self.failures += 1
+        # Only upstream trouble trips the breaker, not our own 4xx requests
+        if is_retryable(error):
+            self.breaker.record_failure()
+
+    # ----------------------------------------
+    # ⚡ Async Calls
+    # ----------------------------------------
+
+    async def call(self, func, key: str = "call", deadline: float | None = None):
+        """
+        Args:
+            func (callable): async func(timeout) -> result
+            key (str): Latency window for this class of call
+            deadline (float): Seconds left for all attempts (default self.deadline)
+        """
+        deadline = self.deadline if deadline is None else deadline
+        self.calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            try:
+                result = await self._hedged(func, self._attempt_timeout(started, deadline), key)
+            except Exception as e:
+                self._failed(e)
+                delay = self._backoff(attempt, e, deadline - (time.monotonic() - started))
+                if delay is None:
+                    raise
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._succeeded(key, time.monotonic() - attempt_started)
+            return result
+
+    async def _hedged(self, func, timeout: float, key: str):
+        delay = self._hedge_delay(key)
+        first = asyncio.ensure_future(func(timeout))
+        if delay is None or delay >= timeout:
+            return await first
+
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+        except asyncio.CancelledError:
+            # asyncio.wait does not cancel what it waits on
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        # Primary is slower than p95: race one backup request against it
+        self.hedges += 1
+        second = asyncio.ensure_future(func(timeout))
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(self, func, key: str = "stream", deadline: float | None = None):
+        """
+        Retries a streamed call only while nothing has been yielded yet;
+        once text reached the caller a failure is passed through.
+        Latency recorded is time-to-first-chunk, not the whole stream.
+
+        Args:
+            func (callable): async generator func(timeout)
+            key (str): Latency window for this class of call
+            deadline (float): Seconds left for all attempts (default self.deadline)
+        """
+        deadline = self.deadline if deadline is None else deadline
+        self.calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            sent = False
+            first_chunk = None
+            try:
+                async for chunk in func(self._attempt_timeout(started, deadline)):
+                    if not sent:
+                        sent, first_chunk = True, time.monotonic() - attempt_started
+                    yield chunk
+            except Exception as e:
+                self._failed(e)
+                delay = None if sent else self._backoff(attempt, e, deadline - (time.monotonic() - started))
+                if delay is None:
+                    raise
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._succeeded(key, first_chunk)
+            return
+
+    # ----------------------------------------
+    # 🧵 Blocking Calls
+    # ----------------------------------------
+
+    def call_sync(self, func, key: str = "call", deadline: float | None = None):
+        """Blocking twin of call() (no hedging)."""
+        deadline = self.deadline if deadline is None else deadline
+        self.calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            self.breaker.allow()
+            attempt_started = time.monotonic()
+            try:
+                result = func(self._attempt_timeout(started, deadline))
+            except Exception as e:
+                self._failed(e)
+                delay = self._backoff(attempt, e, deadline - (time.monotonic() - started))
+                if delay is None:
+                    raise
+                self.retries += 1
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._succeeded(key, time.monotonic() - attempt_started)
+            return result
+
+    def stats(self) -> dict:
+        latency = {}
+        for key, window in list(self.latency.items()):
+            p50, p95 = window.percentile(0.5), window.percentile(0.95)
+            latency[key] = {
+                "samples": len(window),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency": latency,
+            "breaker_state": self.breaker.state,
+            "breaker_rejected": self.breaker.rejected,
+        }
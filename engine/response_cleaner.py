@@ -0,0 +1,131 @@
+# ============================================
+# 🧽 STREAMING RESPONSE CLEANER
+# Strips *stage directions*, "sighs…"/"um" fillers, "s-sometimes"
+# stutters and "..." runs from LLM output chunk by chunk, so cleaned
+# text can flow to the client and TTS as it is generated
+# ============================================
+
+import re
+
+# ============================================
+# 🧭 Patterns (compiled once)
+# ============================================
+
+_STAGE_DIRECTION = re.compile(r"\*[^*\n]*\*")
+_ELLIPSIS = re.compile(r"\.{2,}")
+# Narrated actions drop the rest of their sentence; bare fillers only themselves
+_FILLER = re.compile(r"\b(?:(?:sighs|gulps)\b[^.!?]*[.!?]?|(?:u+h+|u+m+)\b[,.!?]?)", re.IGNORECASE)
+# "s-sometimes", "w-w-well" → "sometimes", "well" (but "X-ray" stays)
+_STUTTER = re.compile(r"\b([A-Za-z])(?:-\1)*-(\1[A-Za-z]*)\b", re.IGNORECASE)
+_SPACES = re.compile(r"\s{2,}|[^\S ]")   # runs, tabs, newlines → one space
+_OPEN_ACTION = re.compile(r"\b(?:sighs|gulps)\b[^.!?]*$", re.IGNORECASE)
+_MAY_HOLD = re.compile(r"\*|sighs|gulps", re.IGNORECASE)
+
+MAX_LOOKBACK = 160   # chars held back at most while waiting for a closing pattern
+
+
+def _clean_segment(text: str) -> str:
+    # Substring checks are far cheaper than a regex pass that finds nothing
+    if "*" in text:
+        text = _STAGE_DIRECTION.sub("", text)
+    if ".." in text:
+        text = _ELLIPSIS.sub(".", text)
+    lowered = text.lower()
+    if "uh" in lowered or "um" in lowered or "sighs" in lowered or "gulps" in lowered:
+        text = _FILLER.sub("", text)
+    if "-" in text:
+        text = _STUTTER.sub(r"\2", text)
+    if "  " in text or "\n" in text or "\t" in text:
+        text = _SPACES.sub(" ", text)
+    return text
+
+# ============================================
+# 🧽 STREAMING CLEANER
+# ============================================
+
+
+class StreamingCleaner:
+    """
+    Incremental cleaner: feed() raw deltas, get back cleaned text that is
+    final. Text is only released at a whitespace boundary where no stage
+    direction or narrated action is still open; anything held longer than
+    MAX_LOOKBACK is released as-is (an unterminated "*" stays literal,
+    like the one-shot regex would leave it).
+    """
+
+    __slots__ = ("_buffer", "_space", "_started", "max_lookback")
+
+    def __init__(self, max_lookback: int = MAX_LOOKBACK):
+        self._buffer = ""
+        self._space = False     # whitespace owed before the next emitted text
+        self._started = False   # anything emitted yet (leading strip)
+        self.max_lookback = max_lookback
+
+    def _is_closed(self, prefix: str) -> bool:
+        line = prefix[prefix.rfind("\n") + 1:]
+        return line.count("*") % 2 == 0 and not _OPEN_ACTION.search(prefix)
+
+    def _safe_cut(self, buffer: str, cut: int) -> int:
+        while cut > 0 and not self._is_closed(buffer[:cut]):
+            cut = max(buffer.rfind(" ", 0, cut), buffer.rfind("\n", 0, cut))
+        return max(cut, 0)
+
+    def _emit(self, segment: str) -> str:
+        segment = _clean_segment(segment)
+        if not segment.strip():
+            self._space = self._space or bool(segment)
+            return ""
+        lead = segment[0] == " "
+        trail = segment[-1] == " "
+        segment = segment.strip()
+        if not self._started:
+            # A stripped leading filler ("Uh, no.") leaves a lowercase start
+            segment = segment[0].upper() + segment[1:]
+        elif self._space or lead:
+            segment = " " + segment
+        self._started = True
+        self._space = trail
+        return segment
+
+    def feed(self, chunk: str) -> str:
+        """Adds a raw delta; returns the cleaned text that is now final."""
+        buffer = self._buffer + chunk
+        last = cut = max(buffer.rfind(" "), buffer.rfind("\n"))
+        # Only a "*" or a narrated action can force text to be held back
+        if cut > 0 and _MAY_HOLD.search(buffer):
+            cut = self._safe_cut(buffer, cut)
+            if cut == 0 and len(buffer) > self.max_lookback:
+                cut = last
+        if cut <= 0:
+            self._buffer = buffer
+            return ""
+        self._buffer = buffer[cut:]
+        return self._emit(buffer[:cut])
+
+    def flush(self) -> str:
+        """Releases whatever is still held at the end of the stream."""
+        segment, self._buffer = self._buffer, ""
+        out = self._emit(segment) if segment else ""
+        self._space = False
+        return out
+
+    def clean(self, text: str) -> str:
+        """One-shot cleaning of a complete reply (no cut search needed)."""
+        self._buffer += text
+        return self.flush()
+
+
+def clean_text(text: str) -> str:
+    return StreamingCleaner().clean(text)
+
+
+async def clean_stream(deltas):
+    """Wraps an async iterator of raw deltas, yielding cleaned deltas."""
+    cleaner = StreamingCleaner()
+    async for delta in deltas:
+        out = cleaner.feed(delta)
+        if out:
+            yield out
+    tail = cleaner.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,205 @@
+# ============================================
+# 🛬 SINGLE-FLIGHT COALESCING
+# Concurrent identical LLM requests share one upstream call:
+# the first caller leads, everyone else awaits its result
+# ============================================
+
+import json
+import asyncio
+import hashlib
+import threading
+
+
+def fingerprint(payload: dict) -> str:
+    """Stable key for a request body (key order does not matter)."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+# ============================================
+# 🧵 Flights
+# ============================================
+
+
+class _SyncFlight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _StreamFlight:
+    """
+    Chunks produced so far + a wake-up event replaced on every chunk.
+    Holds the pump task (the loop only keeps weak references to tasks)
+    and how many consumers are still reading.
+    """
+
+    __slots__ = ("chunks", "finished", "error", "changed", "task", "consumers")
+
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.changed = asyncio.Event()
+        self.task = None
+        self.consumers = 0
+
+    def notify(self):
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+# ============================================
+# 🛬 SINGLE FLIGHT
+# ============================================
+
+
+class SingleFlight:
+    """
+    Deduplicates in-flight calls by key.
+
+    The upstream call runs as its own task, so a leader that disconnects
+    does not cancel the call for the callers sharing it. Streams are
+    fanned out: late joiners replay the chunks already received and then
+    follow live. When the last consumer of a stream leaves early, the
+    upstream stream is cancelled instead of being read to the end.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks = {}     # (loop id, key) -> asyncio.Task
+        self._streams = {}   # (loop id, key) -> _StreamFlight
+        self._sync = {}      # key -> _SyncFlight
+        self.leaders = 0
+        self.coalesced = 0
+        self.abandoned = 0   # streams cancelled because every consumer left
+
+    def _count(self, led: bool):
+        with self._lock:
+            if led:
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+    # ----------------------------------------
+    # ⚡ Async Calls
+    # ----------------------------------------
+
+    async def do(self, key: str, func):
+        """
+        Awaits func() once per key among concurrent callers.
+
+        Args:
+            key (str): Request fingerprint
+            func (callable): Zero-arg coroutine function doing the real call
+        """
+        slot = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(slot)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[slot] = task
+            task.add_done_callback(lambda _: self._tasks.pop(slot, None))
+            self._count(led=True)
+        else:
+            self._count(led=False)
+        return await asyncio.shield(task)
+
+    async def stream(self, key: str, func):
+        """
+        Async generator twin of do() for streamed responses.
+
+        Args:
+            key (str): Request fingerprint
+            func (callable): Zero-arg async generator function
+        """
+        slot = (id(asyncio.get_running_loop()), key)
+        flight = self._streams.get(slot)
+        if flight is None:
+            flight = _StreamFlight()
+            self._streams[slot] = flight
+            flight.task = asyncio.ensure_future(self._pump(slot, flight, func))
+            self._count(led=True)
+        else:
+            self._count(led=False)
+
+        flight.consumers += 1
+        try:
+            sent = 0
+            while True:
+                changed = flight.changed
+                while sent < len(flight.chunks):
+                    yield flight.chunks[sent]
+                    sent += 1
+                if flight.finished:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await changed.wait()
+        finally:
+            flight.consumers -= 1
+            if flight.consumers == 0 and not flight.finished:
+                # 🔌 Nobody is listening any more — stop spending upstream quota
+                self._drop_stream(slot, flight)
+                flight.task.cancel()
+                self.abandoned += 1
+
+    def _drop_stream(self, slot, flight: _StreamFlight):
+        if self._streams.get(slot) is flight:
+            del self._streams[slot]
+
+    async def _pump(self, slot, flight: _StreamFlight, func):
+        try:
+            async for chunk in func():
+                flight.chunks.append(chunk)
+                flight.notify()
+        except BaseException as e:
+            flight.error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            flight.finished = True
+            self._drop_stream(slot, flight)
+            flight.notify()
+
+    # ----------------------------------------
+    # 🧵 Blocking Calls
+    # ----------------------------------------
+
+    def do_sync(self, key: str, func):
+        """Blocking twin of do() for threads (e.g. chat_sync)."""
+        with self._lock:
+            flight = self._sync.get(key)
+            led = flight is None
+            if led:
+                flight = self._sync[key] = _SyncFlight()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not led:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._sync.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict:
+        calls = self.leaders + self.coalesced
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced_calls": self.coalesced,
+            "abandoned_streams": self.abandoned,
+            "in_flight": len(self._tasks) + len(self._streams) + len(self._sync),
+            "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0,
+        }
@@ -0,0 +1,201 @@
+# ============================================
+# 🧪 LOCAL GROQ STAND-IN SERVER
+# OpenAI-compatible /openai/v1/chat/completions (plain + streaming)
+# with configurable latency, token rate, errors and 429s — for load
+# and tail-latency tests without burning real Groq quota
+#
+# Run:   python groq_standin.py --port 8001 --latency lognormal:0.4:0.6 --rate-429 0.05
+# Point the app at it:
+#        GROQ_BASE_URL=http://127.0.0.1:8001/openai/v1 uvicorn main_fastapi:app
+# ============================================
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# ============================================
+# ⚙️ Stand-in Settings
+# ============================================
+
+
+class StandinConfig:
+    """
+    Behaviour knobs (env STANDIN_* or CLI flags).
+
+    latency: "fixed:<s>", "uniform:<lo>:<hi>" or "lognormal:<median>:<sigma>"
+             — time to first token
+    tokens_per_second: streaming/generation throughput after the first token
+    error_rate / rate_429: probability of a 500 / 429 reply per request
+    """
+
+    def __init__(self):
+        self.latency = os.getenv("STANDIN_LATENCY", "lognormal:0.3:0.5")
+        self.tokens_per_second = float(os.getenv("STANDIN_TOKENS_PER_SECOND", "250"))
+        self.error_rate = float(os.getenv("STANDIN_ERROR_RATE", "0"))
+        self.rate_429 = float(os.getenv("STANDIN_RATE_429", "0"))
+        self.retry_after = float(os.getenv("STANDIN_RETRY_AFTER", "1"))
+        self.seed = os.getenv("STANDIN_SEED")
+        self.rng = random.Random(int(self.seed) if self.seed else None)
+
+    def sample_latency(self) -> float:
+        kind, *params = self.latency.split(":")
+        values = [float(p) for p in params]
+        if kind == "fixed":
+            return values[0]
+        if kind == "uniform":
+            return self.rng.uniform(values[0], values[1])
+        if kind == "lognormal":
+            median, sigma = values
+            return self.rng.lognormvariate(0, sigma) * median
+        raise ValueError(f"unknown latency distribution: {self.latency}")
+
+
+CONFIG = StandinConfig()
+
+CANNED_REPLIES = [
+    "It started about three days ago, doctor, and it's been getting worse.",
+    "No, I don't think so. I've never had anything like this before.",
+    "It's a sort of tight feeling, right here in the middle of my chest.",
+    "I'm worried it might be something serious, to be honest.",
+    "I take a tablet for my blood pressure, but nothing else.",
+    "It comes and goes, mostly when I'm walking up the stairs.",
+]
+
+STATS = {"requests": 0, "streams": 0, "errors_500": 0, "errors_429": 0, "tokens": 0}
+
+app = FastAPI()
+
+# ============================================
+# 💬 Helpers
+# ============================================
+
+
+def _reply_tokens(max_tokens: int) -> list:
+    # Whitespace-split words stand in for tokens
+    words = CONFIG.rng.choice(CANNED_REPLIES).split(" ")
+    words = words[:max(1, max_tokens)]
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def _injected_error():
+    roll = CONFIG.rng.random()
+    if roll < CONFIG.rate_429:
+        STATS["errors_429"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit_exceeded"}},
+            headers={"Retry-After": f"{CONFIG.retry_after:g}"},
+        )
+    if roll < CONFIG.rate_429 + CONFIG.error_rate:
+        STATS["errors_500"] += 1
+        return JSONResponse(status_code=500, content={"error": {"message": "Injected failure (stand-in)"}})
+    return None
+
+
+def _usage(messages: list, completion_tokens: int) -> dict:
+    prompt_tokens = sum(len(m.get("content") or "") for m in messages) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+# ============================================
+# ✅ Endpoint: /openai/v1/chat/completions
+# ============================================
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    STATS["requests"] += 1
+    error = _injected_error()
+    latency = CONFIG.sample_latency()
+    tokens = _reply_tokens(int(body.get("max_tokens") or 300))
+    model = body.get("model", "standin")
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    STATS["tokens"] += len(tokens)
+
+    await asyncio.sleep(latency)
+    if error is not None:
+        return error
+
+    if not body.get("stream"):
+        await asyncio.sleep(len(tokens) / CONFIG.tokens_per_second)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(body.get("messages", []), len(tokens)),
+        }
+
+    STATS["streams"] += 1
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        data = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(data)}\n\n"
+
+    async def event_stream():
+        yield chunk({"role": "assistant", "content": ""})
+        for token in tokens:
+            yield chunk({"content": token})
+            await asyncio.sleep(1 / CONFIG.tokens_per_second)
+        yield chunk({}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/standin/stats")
+def standin_stats():
+    return {**STATS, "latency": CONFIG.latency, "tokens_per_second": CONFIG.tokens_per_second,
+            "error_rate": CONFIG.error_rate, "rate_429": CONFIG.rate_429}
+
+# ============================================
+# 🚀 Entry Point
+# ============================================
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible Groq stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", default=CONFIG.latency)
+    parser.add_argument("--tokens-per-second", type=float, default=CONFIG.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=CONFIG.error_rate)
+    parser.add_argument("--rate-429", type=float, default=CONFIG.rate_429)
+    parser.add_argument("--retry-after", type=float, default=CONFIG.retry_after)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    CONFIG.latency = args.latency
+    CONFIG.sample_latency()   # fail fast on a bad distribution string
+    CONFIG.tokens_per_second = args.tokens_per_second
+    CONFIG.error_rate = args.error_rate
+    CONFIG.rate_429 = args.rate_429
+    CONFIG.retry_after = args.retry_after
+    if args.seed is not None:
+        CONFIG.rng.seed(args.seed)
+
+    uvicorn.run(app, host=args.host, port=args.port)
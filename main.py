@@ -6,11 +6,11 @@ import asyncio
 import os
 import winsound
 
-from engine.llm_patient_groq import get_patient_reply_async, generate_examiner_comment
+from engine.llm_patient_groq import get_patient_reply_stream, generate_examiner_comment_async, clean_response
 from runner.runner_globals import SESSION_LOG, reset_patient_memory
 from runner.case_loader import load_case_by_keyword
 from runner.stt_module import transcribe_from_mic_vad  # ✅ VAD-based input
-from runner.tts_module import speak_text  # ✅ Uses edge-tts and playsound
+from runner.tts_pipeline import speak_reply_stream  # ✅ Sentence-by-sentence edge-tts
 
 # ============================================
 # 🧠 Simple Case Picker by Keyword
@@ -54,19 +54,17 @@ async def run_case():
         if doctor_input.strip().lower() in ["exit", "quit", "x"]:
             break
 
-        # 🔄 Get AI Patient Response
-        reply = await get_patient_reply_async(doctor_input, case, phase="history")
+        # 🔄 Stream AI Patient Response + 🔊 speak each sentence as it completes
+        reply = await speak_reply_stream(
+            get_patient_reply_stream(doctor_input, case, phase="history"), clean=clean_response)
         print(f"🗣️ Patient: {reply}")
 
-        # 🔊 Speak the reply
-        await speak_text(reply)
-
         # 📝 Log doctor input
         SESSION_LOG["questions"].append(doctor_input)
 
     # Step 3: Final Feedback
     print("\n📊 Generating feedback from examiner...")
-    feedback = generate_examiner_comment(SESSION_LOG, case)
+    feedback = await generate_examiner_comment_async(SESSION_LOG, case)
     print("\n🧑‍⚖️ Examiner Feedback:\n")
     print(feedback)
 
@@ -1,14 +1,60 @@
 # main_fastapi.py
 
 import asyncio
-from fastapi import FastAPI
-from runner.case_loader import load_case_by_keyword
-from runner.runner_globals import SESSION_LOG, reset_patient_memory
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from runner.case_loader import load_case_by_keyword, warm_case_catalog, start_case_watcher
+from runner.session_state import SESSIONS, aget_session
 from runner.stt_module import transcribe_from_mic_vad
-from runner.tts_module import speak_text
-from engine.llm_patient_groq import get_patient_reply_async, generate_examiner_comment
+from runner.executor import BLOCKING_EXECUTOR, run_blocking
+from runner.event_log import EVENT_LOG, TurnTimer, log_turn, log_reset
+from runner.tts_pipeline import speak_reply_stream
+from engine.llm_patient_groq import get_patient_reply_stream, generate_examiner_comment_async, clean_response
+from engine.feedback import track_question
+from engine.groq_client import get_groq_client
+from engine.reply_cache import REPLY_CACHE
+from engine.intent_router import INTENT_ROUTER
+from engine.llm_scheduler import SchedulerBusy
+from routes import case_route, reply_route, session_route
 
 app = FastAPI()
+app.include_router(case_route.router)
+app.include_router(reply_route.router)
+app.include_router(session_route.router)
+CASE_WATCHER = None
+
+
+@app.exception_handler(SchedulerBusy)
+async def llm_queue_full(request: Request, exc: SchedulerBusy):
+    # 🚦 Too many Groq calls queued — tell the client when to come back
+    return JSONResponse(
+        status_code=429,
+        content={"error": "⏳ Patient is busy, please retry.", "retry_after": exc.retry_after},
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+
+@app.on_event("startup")
+def load_case_catalog():
+    global CASE_WATCHER
+    # 📚 Parse and index every case once, before the first request
+    warm_case_catalog()
+    # 👀 Hot-reload edited case files in the background
+    CASE_WATCHER = start_case_watcher()
+    # 🧹 Evict idle sessions in the background
+    SESSIONS.start_sweeper()
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    if CASE_WATCHER is not None:
+        CASE_WATCHER.stop()
+    # 🌐 Close pooled Groq connections
+    await get_groq_client().aclose()
+    BLOCKING_EXECUTOR.shutdown()
+    SESSIONS.close()
+    # 📼 Commit any turn events still queued
+    EVENT_LOG.close()
 
 
 @app.get("/")
@@ -16,27 +62,50 @@ def home():
     return {"message": "UKMLA AI Voice Sim Running!"}
 
 
+@app.get("/metrics")
+def get_metrics():
+    # 📈 Counters for tuning caches and LLM usage
+    return {
+        "reply_cache": REPLY_CACHE.stats(),
+        "intent_fast_path": INTENT_ROUTER.stats(),
+        "groq_client": get_groq_client().stats(),
+        "executor": BLOCKING_EXECUTOR.stats(),
+        "sessions": SESSIONS.stats(),
+        "event_log": EVENT_LOG.stats(),
+    }
+
+
 @app.get("/run")
-async def run_interactive_case(keyword: str = "herpes"):
+async def run_interactive_case(session_id: str, keyword: str = "herpes"):
     case = load_case_by_keyword(keyword)
     if not case:
         return {"error": "❌ Case not found."}
+    session = await aget_session(session_id)
+    timer = TurnTimer()
 
-    # 🎤 Doctor Speaks
-    doctor_input = transcribe_from_mic_vad()
+    # 🎤 Doctor Speaks — mic capture + Google STT block, so they run on the
+    # bounded executor instead of the event loop
+    with timer.stage("stt"):
+        doctor_input = await run_blocking("stt", transcribe_from_mic_vad)
     print(f"🩺 Doctor: {doctor_input}")
 
     if doctor_input.strip().lower() in ["exit", "quit", "x"]:
         return {"message": "🔚 Session ended."}
 
-    # 🤖 Patient Replies
-    reply = await get_patient_reply_async(doctor_input, case, phase="history")
+    # 🤖 Patient Replies — each sentence is spoken as soon as it is ready
+    with timer.stage("reply"):
+        reply = await speak_reply_stream(
+            timer.first_chunk(get_patient_reply_stream(doctor_input, case, phase="history", session=session)),
+            clean=clean_response)
     print(f"🗣️ Patient: {reply}")
-    await speak_text(reply)
 
-    SESSION_LOG["questions"].append(doctor_input)
+    session.log.questions.append(doctor_input)
+    track_question(doctor_input, session.log)
+    await SESSIONS.asave(session)
+    log_turn(session, case, "history", "/run", doctor_input, reply, timer)
 
     return {
+        "session_id": session.session_id,
         "doctor_said": doctor_input,
         "patient_replied": reply,
         "status": "✅ Interaction complete"
@@ -44,8 +113,12 @@ async def run_interactive_case(keyword: str = "herpes"):
 
 
 @app.get("/feedback")
-def get_feedback(keyword: str = "herpes"):
+async def get_feedback(session_id: str, keyword: str = "herpes"):
     case = load_case_by_keyword(keyword)
-    feedback = generate_examiner_comment(SESSION_LOG, case)
-    reset_patient_memory()
-    return {"feedback": feedback}
+    session = await aget_session(session_id)
+    feedback = await generate_examiner_comment_async(session.log, case)
+    # 🔁 Station over — only this candidate's memory and transcript reset
+    session.reset()
+    await SESSIONS.asave(session)
+    log_reset(session, case)
+    return {"session_id": session.session_id, "feedback": feedback}
@@ -0,0 +1,179 @@
+# ============================================
+# 🔁 SESSION REPLAY TOOL
+# Reads the turn event log (runner/event_log.py) and either
+#   --rebuild  rebuilds a session's memory + transcript from its turns
+#              (optionally saving it back into the session store), or
+#   --rerun    re-asks every doctor line against another model, with the
+#              conversation rebuilt from the new replies, and prints
+#              old vs new reply and latency per turn
+#
+# Run:   python replay_session.py --list
+#        python replay_session.py <session_id> --rebuild [--save]
+#        python replay_session.py <session_id> --rerun --model llama3-70b-8192 [--out rerun.jsonl]
+# ============================================
+
+import json
+import time
+import argparse
+from collections import Counter
+from runner.event_log import EVENT_LOG_PATH, EVENT_TURN, EVENT_RESET, read_events
+from runner.session_state import Session, SESSIONS
+from runner.case_loader import load_case_by_keyword, warm_case_catalog
+
+# ============================================
+# 🗂️ Case Lookup
+# ============================================
+
+_CASES = {}
+
+
+def case_for(event: dict):
+    case_id = event.get("case_id")
+    if not case_id:
+        return None
+    if case_id not in _CASES:
+        _CASES[case_id] = load_case_by_keyword(case_id)
+    return _CASES[case_id]
+
+# ============================================
+# 🧱 Rebuild
+# ============================================
+
+
+def rebuild_session(events: list, session_id: str) -> Session:
+    """
+    Replays logged turns into a fresh Session — same transcript log and
+    conversation memory the live app had after the last event.
+    """
+    from engine.llm_patient_groq import FALLBACK_REPLY
+    from engine.feedback import track_question
+
+    session = Session(session_id)
+    for event in events:
+        if event["type"] == EVENT_RESET:
+            session.reset()
+            continue
+        if event["type"] != EVENT_TURN:
+            continue
+        session.log.questions.append(event["doctor"])
+        track_question(event["doctor"], session.log)
+        if event.get("mood"):
+            session.memory.patient_mood = event["mood"]
+        reply = event.get("reply")
+        if reply and reply != FALLBACK_REPLY:
+            case = case_for(event)
+            session.memory.conversation.add_turn(event["doctor"], reply, case.symptoms if case else ())
+    if events:
+        session.created_at = events[0]["ts"]
+        session.last_seen = events[-1]["ts"]
+    return session
+
+# ============================================
+# 🧪 Re-run Against a Model
+# ============================================
+
+
+def rerun_session(events: list, session_id: str, model: str):
+    """
+    Yields one result dict per turn. Each doctor line goes straight to
+    the model (no intent fast-path or reply cache) as a blocking call at
+    batch priority. That only ranks it within this process: the server's
+    scheduler lives in another process and does not see replays, so set
+    GROQ_RPM / GROQ_TPM for the replay to leave the live app headroom.
+    """
+    from engine.llm_patient_groq import build_patient_messages, generate_reply_messages, FALLBACK_REPLY
+    from engine.llm_scheduler import PRIORITY_BATCH
+
+    session = Session(f"replay-{session_id}")
+    for event in events:
+        if event["type"] == EVENT_RESET:
+            session.reset()
+            continue
+        if event["type"] != EVENT_TURN:
+            continue
+        case = case_for(event)
+        if case is None:
+            print(f"⚠️ Case {event.get('case_id')!r} not found — skipping turn")
+            continue
+        if event.get("mood"):
+            session.memory.patient_mood = event["mood"]
+
+        messages = build_patient_messages(event["doctor"], case, event.get("phase", "history"), session)
+        started = time.monotonic()
+        reply = generate_reply_messages(messages, model=model, priority=PRIORITY_BATCH)
+        latency_ms = round((time.monotonic() - started) * 1000, 1)
+        if reply != FALLBACK_REPLY:
+            session.memory.conversation.add_turn(event["doctor"], reply, case.symptoms)
+
+        yield {
+            "ts": event["ts"],
+            "doctor": event["doctor"],
+            "original_reply": event.get("reply"),
+            "original_latency_ms": event.get("latency_ms", {}),
+            "model": model,
+            "reply": reply,
+            "latency_ms": latency_ms,
+        }
+
+# ============================================
+# ▶️ CLI
+# ============================================
+
+
+def list_sessions(path: str):
+    turns = Counter(e["session_id"] for e in read_events(path) if e["type"] == EVENT_TURN)
+    for session_id, count in turns.most_common():
+        print(f"{session_id:<34} {count:5d} turns")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or re-run a session from the turn event log")
+    parser.add_argument("session_id", nargs="?")
+    parser.add_argument("--log", default=EVENT_LOG_PATH, help="event log path")
+    parser.add_argument("--list", action="store_true", help="list logged sessions")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild memory + transcript")
+    parser.add_argument("--save", action="store_true", help="with --rebuild: write it to the session store")
+    parser.add_argument("--rerun", action="store_true", help="re-ask every turn against --model")
+    parser.add_argument("--model", help="model for --rerun")
+    parser.add_argument("--out", help="with --rerun: also write results as JSONL")
+    args = parser.parse_args()
+
+    if args.list:
+        list_sessions(args.log)
+        return
+    if not args.session_id or args.rebuild == args.rerun:
+        parser.error("give a session_id and exactly one of --rebuild / --rerun")
+    if args.rerun and not args.model:
+        parser.error("--rerun needs --model")
+
+    events = list(read_events(args.log, args.session_id))
+    if not events:
+        print(f"❌ No events for session {args.session_id}")
+        return
+    warm_case_catalog()
+
+    if args.rebuild:
+        session = rebuild_session(events, args.session_id)
+        print(f"🧱 Rebuilt {args.session_id}: {len(session.log.questions)} questions, "
+              f"{len(session.memory.conversation.turns)} turns in memory")
+        print(json.dumps(session.log.to_dict(), indent=2, ensure_ascii=False))
+        if args.save:
+            SESSIONS.store.put(session)
+            print(f"💾 Saved to the {SESSIONS.store.name} session store")
+        return
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        for result in rerun_session(events, args.session_id, args.model):
+            print(f"\n🩺 {result['doctor']}")
+            print(f"   before ({result['original_latency_ms'].get('total_ms', '?')} ms): {result['original_reply']}")
+            print(f"   {args.model} ({result['latency_ms']} ms): {result['reply']}")
+            if out is not None:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not None:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
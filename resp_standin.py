@@ -0,0 +1,207 @@
+# ============================================
+# 🧪 LOCAL REDIS (RESP) STAND-IN SERVER
+# In-memory key/value server speaking enough of the Redis protocol for
+# the redis session backend (PING, GET, SET [EX|PX], DEL, EXISTS,
+# EXPIRE, TTL, DBSIZE, FLUSHDB, SELECT) — for multi-worker tests
+# without installing Redis
+#
+# Run:   python resp_standin.py --port 6379
+# Point the app at it:
+#        UKMLA_SESSION_BACKEND=redis UKMLA_REDIS_URL=redis://127.0.0.1:6379/0 \
+#        uvicorn main_fastapi:app --workers 4
+# ============================================
+
+import time
+import asyncio
+import argparse
+
+# ============================================
+# 🗄️ Keyspace
+# ============================================
+
+
+class Keyspace:
+    """Keys with optional expiry; expired keys are dropped lazily on access."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}   # key -> monotonic deadline
+
+    def _alive(self, key: bytes) -> bool:
+        deadline = self.expires.get(key)
+        if deadline is not None and time.monotonic() >= deadline:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def purge(self) -> int:
+        now = time.monotonic()
+        expired = [k for k, deadline in self.expires.items() if now >= deadline]
+        for key in expired:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return len(expired)
+
+    def get(self, key: bytes):
+        return self.data[key] if self._alive(key) else None
+
+    def set(self, key: bytes, value: bytes, ttl: float | None = None):
+        self.data[key] = value
+        if ttl is None:
+            self.expires.pop(key, None)
+        else:
+            self.expires[key] = time.monotonic() + ttl
+
+    def delete(self, key: bytes) -> bool:
+        alive = self._alive(key)
+        self.data.pop(key, None)
+        self.expires.pop(key, None)
+        return alive
+
+    def expire(self, key: bytes, ttl: float) -> bool:
+        if not self._alive(key):
+            return False
+        self.expires[key] = time.monotonic() + ttl
+        return True
+
+    def ttl(self, key: bytes) -> int:
+        if not self._alive(key):
+            return -2
+        deadline = self.expires.get(key)
+        return -1 if deadline is None else max(0, round(deadline - time.monotonic()))
+
+    def flush(self):
+        self.data.clear()
+        self.expires.clear()
+
+
+KEYSPACE = Keyspace()
+
+# ============================================
+# 📡 RESP Encoding
+# ============================================
+
+
+def simple(text: str) -> bytes:
+    return b"+" + text.encode() + b"\r\n"
+
+
+def error(text: str) -> bytes:
+    return b"-ERR " + text.encode() + b"\r\n"
+
+
+def integer(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+def bulk(value: bytes | None) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def read_command(reader: asyncio.StreamReader) -> list | None:
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command (e.g. typed into telnet)
+        return line.strip().split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        length = int(header[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+# ============================================
+# ⚙️ Commands
+# ============================================
+
+
+def execute(args: list) -> bytes:
+    name = args[0].upper()
+    if name == b"PING":
+        return bulk(args[1]) if len(args) > 1 else simple("PONG")
+    if name == b"GET" and len(args) == 2:
+        return bulk(KEYSPACE.get(args[1]))
+    if name == b"SET" and len(args) >= 3:
+        ttl = None
+        options = [a.upper() for a in args[3:]]
+        if b"EX" in options:
+            ttl = float(args[3 + options.index(b"EX") + 1])
+        elif b"PX" in options:
+            ttl = float(args[3 + options.index(b"PX") + 1]) / 1000
+        KEYSPACE.set(args[1], args[2], ttl)
+        return simple("OK")
+    if name == b"DEL" and len(args) >= 2:
+        return integer(sum(KEYSPACE.delete(k) for k in args[1:]))
+    if name == b"EXISTS" and len(args) >= 2:
+        return integer(sum(KEYSPACE.get(k) is not None for k in args[1:]))
+    if name == b"EXPIRE" and len(args) == 3:
+        return integer(int(KEYSPACE.expire(args[1], float(args[2]))))
+    if name == b"TTL" and len(args) == 2:
+        return integer(KEYSPACE.ttl(args[1]))
+    if name == b"DBSIZE":
+        KEYSPACE.purge()
+        return integer(len(KEYSPACE.data))
+    if name == b"FLUSHDB":
+        KEYSPACE.flush()
+        return simple("OK")
+    if name in (b"SELECT", b"QUIT"):
+        # Single keyspace — every db index shares it
+        return simple("OK")
+    return error(f"unknown command or wrong number of arguments for '{name.decode(errors='replace')}'")
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            args = await read_command(reader)
+            if not args:
+                break
+            try:
+                reply = execute(args)
+            except ValueError as e:
+                reply = error(str(e))
+            writer.write(reply)
+            await writer.drain()
+            if args[0].upper() == b"QUIT":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def purge_expired(interval: float):
+    # 🧹 Active expiry, like Redis — idle expired keys don't pile up
+    while True:
+        await asyncio.sleep(interval)
+        KEYSPACE.purge()
+
+
+async def serve(host: str, port: int):
+    server = await asyncio.start_server(handle_client, host, port)
+    print(f"🧪 RESP stand-in listening on {host}:{port}")
+    purger = asyncio.create_task(purge_expired(1.0))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        purger.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Redis-protocol stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
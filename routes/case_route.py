@@ -0,0 +1,23 @@
+# ============================================
+# ✅ routes/case_route.py
+# ============================================
+
+from fastapi import APIRouter, Query
+from runner.case_loader import search_cases
+
+router = APIRouter()
+
+MAX_SEARCH_RESULTS = 50
+
+
+# ============================================
+# ✅ Endpoint: /cases/search
+# ============================================
+
+@router.get("/cases/search")
+async def search_case_library(q: str, k: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS)):
+    """
+    Returns the top-k cases for a partial query, best match first.
+    Used by clients to autocomplete the station picker.
+    """
+    return {"query": q, "results": search_cases(q, k)}
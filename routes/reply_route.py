@@ -0,0 +1,112 @@
+# ============================================
+# ✅ routes/reply_route.py
+# ============================================
+
+import json
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from runner.case_loader import load_case_by_keyword
+from runner.session_state import SESSIONS, aget_session
+from runner.tts_pipeline import pipeline_tts
+from runner.event_log import TurnTimer, log_turn
+from engine.llm_patient_groq import get_patient_reply_stream, clean_response
+from engine.feedback import track_question
+from engine.llm_scheduler import LLM_SCHEDULER, SchedulerBusy
+
+router = APIRouter()
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Formats one Server-Sent Event (JSON data keeps newlines safe)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# ============================================
+# ✅ Endpoint: /reply/stream
+# ============================================
+
+@router.get("/reply/stream")
+async def stream_patient_reply(text: str, session_id: str, keyword: str = "herpes", phase: str = "history"):
+    """
+    Streams the patient's reply to the doctor's text as Server-Sent Events.
+
+    Events:
+        token — {"text": "<raw delta>"} as soon as Groq produces it
+        done  — {"reply": "<full cleaned reply>"} once the stream ends
+        busy  — {"retry_after": <seconds>} if the LLM queue filled up mid-request
+    """
+    case = load_case_by_keyword(keyword)
+    if not case:
+        raise HTTPException(status_code=404, detail="❌ Case not found.")
+    # 🚦 Reject with 429 before the stream starts if the LLM queue is full
+    LLM_SCHEDULER.admit()
+    session = await aget_session(session_id)
+    timer = TurnTimer()
+
+    async def event_stream():
+        parts = []
+        try:
+            async for delta in timer.first_chunk(get_patient_reply_stream(text, case, phase, session=session)):
+                parts.append(delta)
+                yield sse_event("token", {"text": delta})
+        except SchedulerBusy as e:
+            yield sse_event("busy", {"retry_after": e.retry_after})
+            return
+        reply = clean_response("".join(parts))
+        session.log.questions.append(text)
+        track_question(text, session.log)
+        await SESSIONS.asave(session)
+        # Before the last yield: the client may disconnect as soon as it has "done"
+        log_turn(session, case, phase, "/reply/stream", text, reply, timer)
+        yield sse_event("done", {"reply": reply})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================
+# ✅ Endpoint: /reply/audio
+# ============================================
+
+@router.get("/reply/audio")
+async def stream_patient_audio(text: str, session_id: str, keyword: str = "herpes", phase: str = "history"):
+    """
+    Streams the patient's reply as MP3, one sentence segment at a time.
+    The first segment is sent as soon as the first sentence is synthesized.
+    """
+    case = load_case_by_keyword(keyword)
+    if not case:
+        raise HTTPException(status_code=404, detail="❌ Case not found.")
+    LLM_SCHEDULER.admit()
+    session = await aget_session(session_id)
+    timer = TurnTimer()
+
+    # 🚦 MP3 has no room for a "busy" event: wait for the first sentence
+    # before the response starts, so a full LLM queue is still a 429
+    sentences = pipeline_tts(
+        timer.first_chunk(get_patient_reply_stream(text, case, phase, session=session)),
+        clean=clean_response)
+    item = await anext(sentences, None)
+
+    async def audio_stream():
+        spoken = []
+        current = item
+        try:
+            while current is not None:
+                sentence, audio = current
+                spoken.append(sentence)
+                if audio:
+                    timer.mark("first_audio_ms")
+                    yield audio
+                current = await anext(sentences, None)
+        finally:
+            await sentences.aclose()
+        session.log.questions.append(text)
+        track_question(text, session.log)
+        await SESSIONS.asave(session)
+        log_turn(session, case, phase, "/reply/audio", text, " ".join(spoken), timer)
+
+    return StreamingResponse(audio_stream(), media_type="audio/mpeg")
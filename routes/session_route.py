@@ -0,0 +1,38 @@
+# ============================================
+# ✅ routes/session_route.py
+# ============================================
+
+from fastapi import APIRouter, HTTPException
+from runner.session_state import SESSIONS
+
+router = APIRouter()
+
+
+# ============================================
+# ✅ Endpoint: /sessions
+# ============================================
+
+@router.post("/sessions")
+async def start_session():
+    """
+    Starts a new station and returns its id. Clients must pass it as
+    ?session_id=… to /run, /reply/* and /feedback.
+    """
+    session = await SESSIONS.acreate()
+    return {"session_id": session.session_id}
+
+
+@router.get("/sessions/{session_id}")
+async def get_session_log(session_id: str):
+    """Returns the transcript log collected so far for one session."""
+    session = await SESSIONS.aget(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="❌ Session not found.")
+    return {"session_id": session_id, "log": session.log.to_dict()}
+
+
+@router.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    if not await SESSIONS.adrop(session_id):
+        raise HTTPException(status_code=404, detail="❌ Session not found.")
+    return {"session_id": session_id, "status": "ended"}
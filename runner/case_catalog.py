@@ -0,0 +1,418 @@
+# ============================================
+# 📚 CASE CATALOG MODULE for UKMLA STATION
+# Parses every case JSON once and keeps inverted indexes in memory
+# Used by case_loader.load_case_by_keyword instead of walking the disk
+# ============================================
+
+import os
+import json
+import threading
+from bisect import bisect_left
+from runner.case_search import TrigramIndex
+
+# ============================================
+# 🗂️ Indexed Fields
+# Primary fields keep the original matching rules (file name, id,
+# station, diagnosis). Secondary fields are only tried if nothing
+# in the primary fields matches.
+# ============================================
+
+PRIMARY_FIELDS = ("file_name", "case_id", "station_name", "diagnosis")
+SECONDARY_FIELDS = ("tags", "sub_category")
+
+
+def case_fields(case: dict, file_name: str) -> dict:
+    """
+    Extracts the text a case is indexed and summarised under.
+
+    Returns:
+        dict: {field: [text, ...]} for PRIMARY_FIELDS + SECONDARY_FIELDS
+    """
+    fields = {"file_name": [file_name]}
+    for field in PRIMARY_FIELDS[1:] + SECONDARY_FIELDS:
+        value = case.get(field)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        fields[field] = [v.strip() for v in values if isinstance(v, str) and v.strip()]
+    return fields
+
+
+def case_index_values(fields: dict) -> tuple[set, set]:
+    """
+    Lowercases case_fields() output into keyword index values.
+
+    Returns:
+        tuple: (primary values, secondary values)
+    """
+    primary = {v.lower() for f in PRIMARY_FIELDS for v in fields.get(f, [])}
+    secondary = {v.lower() for f in SECONDARY_FIELDS for v in fields.get(f, [])}
+    return primary, secondary
+
+# ============================================
+# 🔎 Keyword Index (exact dict + sorted suffix list)
+# ============================================
+
+
+class _KeywordIndex:
+    """
+    Maps lowercase values to case paths.
+
+    `exact` answers full-value lookups in O(1). `suffixes` is a sorted
+    list of (suffix, path) pairs, so any substring of a value is the
+    prefix of one of its suffixes and can be found with a bisect.
+    """
+
+    __slots__ = ("exact", "suffixes")
+
+    def __init__(self, exact=None, suffixes=None):
+        self.exact = exact if exact is not None else {}
+        self.suffixes = suffixes if suffixes is not None else []
+
+    def copy(self) -> "_KeywordIndex":
+        return _KeywordIndex(
+            {value: set(paths) for value, paths in self.exact.items()},
+            list(self.suffixes),
+        )
+
+    def add(self, path: str, values: set, keep_sorted: bool = True):
+        for value in values:
+            self.exact.setdefault(value, set()).add(path)
+            for i in range(len(value)):
+                pair = (value[i:], path)
+                if not keep_sorted:
+                    self.suffixes.append(pair)
+                    continue
+                pos = bisect_left(self.suffixes, pair)
+                if pos == len(self.suffixes) or self.suffixes[pos] != pair:
+                    self.suffixes.insert(pos, pair)
+
+    def finalize(self):
+        """Sorts suffixes appended with keep_sorted=False."""
+        self.suffixes = sorted(set(self.suffixes))
+
+    def remove(self, path: str, values: set):
+        for value in values:
+            paths = self.exact.get(value)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.exact[value]
+            for i in range(len(value)):
+                pair = (value[i:], path)
+                pos = bisect_left(self.suffixes, pair)
+                if pos < len(self.suffixes) and self.suffixes[pos] == pair:
+                    del self.suffixes[pos]
+
+    def find_exact(self, keyword: str) -> str | None:
+        paths = self.exact.get(keyword)
+        return min(paths) if paths else None
+
+    def find_partial(self, keyword: str) -> str | None:
+        """Returns the first path (in path order) whose values contain keyword."""
+        best = None
+        pos = bisect_left(self.suffixes, (keyword, ""))
+        while pos < len(self.suffixes):
+            suffix, path = self.suffixes[pos]
+            if not suffix.startswith(keyword):
+                break
+            if best is None or path < best:
+                best = path
+            pos += 1
+        return best
+
+# ============================================
+# 📦 Packed Case Placeholder
+# Stands in for a case that still lives inside a memory-mapped pack
+# ============================================
+
+
+class _PackedCase:
+    __slots__ = ("pack", "record")
+
+    def __init__(self, pack, record: int):
+        self.pack = pack
+        self.record = record
+
+# ============================================
+# 📸 Catalog Snapshot
+# Readers only ever see a complete snapshot; writers build a new one
+# and swap the reference in a single assignment.
+# ============================================
+
+
+class _CatalogSnapshot:
+    __slots__ = ("cases", "stats", "fields", "primary", "secondary", "search")
+
+    def __init__(self, cases=None, stats=None, fields=None, primary=None, secondary=None, search=None):
+        self.cases = cases if cases is not None else {}
+        self.stats = stats if stats is not None else {}
+        self.fields = fields if fields is not None else {}
+        self.primary = primary if primary is not None else _KeywordIndex()
+        self.secondary = secondary if secondary is not None else _KeywordIndex()
+        self.search = search if search is not None else TrigramIndex()
+
+    def copy(self) -> "_CatalogSnapshot":
+        return _CatalogSnapshot(
+            dict(self.cases),
+            dict(self.stats),
+            dict(self.fields),
+            self.primary.copy(),
+            self.secondary.copy(),
+            self.search.copy(),
+        )
+
+    def put(self, path: str, case, stat=None, keep_sorted: bool = True, fields=None):
+        self.drop(path)
+        if fields is None:
+            fields = case_fields(case, os.path.basename(path))
+        primary, secondary = case_index_values(fields)
+        self.cases[path] = case
+        self.stats[path] = stat
+        self.fields[path] = fields
+        self.primary.add(path, primary, keep_sorted)
+        self.secondary.add(path, secondary, keep_sorted)
+        self.search.add(path, fields)
+
+    def finalize(self):
+        self.primary.finalize()
+        self.secondary.finalize()
+
+    def drop(self, path: str):
+        fields = self.fields.pop(path, None)
+        self.cases.pop(path, None)
+        self.stats.pop(path, None)
+        if fields is not None:
+            primary, secondary = case_index_values(fields)
+            self.primary.remove(path, primary)
+            self.secondary.remove(path, secondary)
+            self.search.remove(path)
+
+# ============================================
+# 📚 CASE CATALOG
+# ============================================
+
+
+class CaseCatalog:
+    """
+    In-memory catalog of every case JSON under a base directory.
+
+    Args:
+        base_dir (str): Folder to index, e.g. "data/history_based"
+        enrich (callable): Optional hook applied once to each parsed case
+            dict; whatever it returns (e.g. a Case) is what gets cached
+    """
+
+    def __init__(self, base_dir: str = "data/history_based", enrich=None):
+        self.base_dir = base_dir
+        self.enrich = enrich
+        self._snapshot = _CatalogSnapshot()
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.cases)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._snapshot.cases
+
+    def paths(self) -> list:
+        return sorted(self._snapshot.cases)
+
+    # ----------------------------------------
+    # 🏗️ Building
+    # ----------------------------------------
+
+    def iter_case_files(self):
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs.sort()
+            for file in sorted(files):
+                if file.endswith(".json"):
+                    yield os.path.join(root, file)
+
+    def scan_stats(self) -> dict:
+        """Returns {path: (mtime_ns, size)} for every case file on disk."""
+        stats = {}
+        for path in self.iter_case_files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def file_stats(self) -> dict:
+        """Returns the (mtime_ns, size) each cached case was parsed at."""
+        return dict(self._snapshot.stats)
+
+    def parse_file(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            case = json.load(f)
+        if not isinstance(case, dict):
+            raise ValueError("case file must contain a JSON object")
+        case["file_path"] = path
+        if self.enrich is not None:
+            case = self.enrich(case)
+        return case
+
+    def build(self) -> "CaseCatalog":
+        """Parses every case file and replaces the current snapshot."""
+        snapshot = _CatalogSnapshot()
+        for path, stat in self.scan_stats().items():
+            try:
+                snapshot.put(path, self.parse_file(path), stat, keep_sorted=False)
+            except Exception as e:
+                print(f"❌ Error reading {os.path.basename(path)}: {e}")
+        snapshot.finalize()
+        with self._write_lock:
+            self._snapshot = snapshot
+        return self
+
+    def build_from_pack(self, pack) -> "CaseCatalog":
+        """
+        Indexes the records a CasePack holds for base_dir without
+        decoding them; bodies are decoded on lookup.
+        """
+        snapshot = _CatalogSnapshot()
+        for record in pack.section(self.base_dir):
+            snapshot.put(pack.path(record), _PackedCase(pack, record), pack.stat(record),
+                         keep_sorted=False, fields=pack.fields(record))
+        snapshot.finalize()
+        with self._write_lock:
+            self._snapshot = snapshot
+        return self
+
+    def apply_changes(self, changed: dict, removed=()) -> list:
+        """
+        Reparses only the changed files and swaps in a new snapshot.
+
+        Args:
+            changed (dict): {path: (mtime_ns, size)} of added/edited files
+            removed (iterable): Paths that no longer exist
+
+        Returns:
+            list: Paths that failed to parse (their old version is kept)
+        """
+        parsed, failed = {}, []
+        for path, stat in changed.items():
+            try:
+                parsed[path] = self.parse_file(path)
+            except Exception as e:
+                print(f"⚠️ Keeping previous version of {os.path.basename(path)}: {e}")
+                failed.append(path)
+
+        if not parsed and not removed:
+            return failed
+
+        with self._write_lock:
+            snapshot = self._snapshot.copy()
+            for path in removed:
+                snapshot.drop(path)
+            for path, case in parsed.items():
+                snapshot.put(path, case, changed[path])
+            self._snapshot = snapshot
+        return failed
+
+    # ----------------------------------------
+    # 🔍 Lookup
+    # ----------------------------------------
+
+    def _materialize(self, snapshot: _CatalogSnapshot, path: str, case):
+        if isinstance(case, _PackedCase):
+            placeholder = case
+            case = placeholder.pack.load(placeholder.record)
+            case["file_path"] = path
+            if self.enrich is not None:
+                case = self.enrich(case)
+            # Keep the built object so the next lookup skips decoding
+            if snapshot.cases.get(path) is placeholder:
+                snapshot.cases[path] = case
+        return dict(case) if isinstance(case, dict) else case
+
+    def get(self, path: str) -> dict | None:
+        snapshot = self._snapshot
+        case = snapshot.cases.get(path)
+        return self._materialize(snapshot, path, case) if case is not None else None
+
+    def find_path(self, keyword: str) -> str | None:
+        """
+        Resolves a keyword to a case path.
+
+        Exact values win, then partial matches in the primary fields,
+        then partial matches in tags / sub_category. Ties go to the
+        first path in sorted order.
+        """
+        return self._find_path(self._snapshot, keyword)
+
+    @staticmethod
+    def _find_path(snapshot: _CatalogSnapshot, keyword: str) -> str | None:
+        keyword = keyword.strip().lower()
+        if not snapshot.cases:
+            return None
+        if not keyword:
+            return min(snapshot.cases)
+
+        return (
+            snapshot.primary.find_exact(keyword)
+            or snapshot.primary.find_partial(keyword)
+            or snapshot.secondary.find_exact(keyword)
+            or snapshot.secondary.find_partial(keyword)
+        )
+
+    def search(self, query: str, k: int = 10) -> list:
+        """
+        Ranked fuzzy search over id, station, diagnosis, tags and file name.
+
+        Returns:
+            list: Up to k summaries, best first, each with a "score"
+        """
+        snapshot = self._snapshot
+        results = []
+        for score, path in snapshot.search.search(query, k):
+            fields = snapshot.fields[path]
+            results.append({
+                "case_id": next(iter(fields.get("case_id", [])), None),
+                "station_name": next(iter(fields.get("station_name", [])), None),
+                "diagnosis": next(iter(fields.get("diagnosis", [])), None),
+                "sub_category": next(iter(fields.get("sub_category", [])), None),
+                "tags": list(fields.get("tags", [])),
+                "file_path": path,
+                "score": score,
+            })
+        return results
+
+    def lookup(self, keyword: str) -> dict | None:
+        """
+        Returns the matching case (dicts are shallow-copied), or None.
+        """
+        snapshot = self._snapshot
+        path = self._find_path(snapshot, keyword)
+        if path is None:
+            return None
+        case = snapshot.cases.get(path)
+        return self._materialize(snapshot, path, case) if case is not None else None
+
+# ============================================
+# 🌍 Shared Catalogs (one per base directory)
+# ============================================
+
+
+_CATALOGS = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def get_catalog(base_dir: str = "data/history_based", enrich=None, pack=None) -> CaseCatalog:
+    """
+    Returns the shared catalog for base_dir, building it on first use.
+    If a CasePack holding base_dir is given, the catalog is indexed from
+    the pack instead of parsing the folder.
+    """
+    catalog = _CATALOGS.get(base_dir)
+    if catalog is None:
+        with _CATALOGS_LOCK:
+            catalog = _CATALOGS.get(base_dir)
+            if catalog is None:
+                catalog = CaseCatalog(base_dir, enrich=enrich)
+                if pack is not None and pack.section(base_dir):
+                    catalog.build_from_pack(pack)
+                else:
+                    catalog.build()
+                _CATALOGS[base_dir] = catalog
+    return catalog
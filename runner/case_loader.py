@@ -6,6 +6,11 @@
 
 import os
 import json
+from runner.case_catalog import get_catalog
+from runner.case_model import Case
+from runner.case_pack import open_case_pack
+from runner.risk_factors import get_risk_factor_store
+from runner.case_watcher import CaseWatcher, DEFAULT_POLL_INTERVAL
 
 # ============================================
 # 🧠 OPTIONAL: Enrich case with extra fields (e.g., symptoms)
@@ -30,6 +35,13 @@ def enrich_case(case):
         ])
     return case
 
+
+def compile_case(case: dict) -> Case:
+    """
+    Enriches and validates a parsed case once, as the catalog loads it.
+    """
+    return Case.from_dict(enrich_case(case))
+
 # ============================================
 # 📁 CASE PATH RESOLVER
 # ============================================
@@ -83,58 +95,49 @@ def load_case(case_name: str, level: str, category: str = "history_based") -> di
 # ============================================
 
 
-def load_case_by_keyword(keyword: str, base_dir="data/history_based") -> dict | None:
-    """
-    Finds and loads a case JSON file by matching keyword in case_id or station_name.
-    Accepts partial, lowercase matches.
+def load_case_by_keyword(keyword: str, base_path="data/history_based") -> Case | None:
     """
-    keyword = keyword.strip().lower()
+    Looks up a case in the in-memory catalog for base_path.
+    Matches filename, case_id, station_name or diagnosis, then tags and
+    sub_category. Supports partial keywords like '002', 'herpes', 'mi'.
 
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith(".json"):
-                full_path = os.path.join(root, file)
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        case_data = json.load(f)
-                        case_id = case_data.get("case_id", "").lower()
-                        station = case_data.get("station_name", "").lower()
-                        if keyword in case_id or keyword in station:
-                            case_data["file_path"] = full_path
-                            return enrich_case(case_data)
-                except Exception as e:
-                    print(f"⚠️ Error loading file {file}: {e}")
-    return None
+    Returns:
+        Case or None (read-only; case.get("key") works like a dict)
+    """
+    return get_catalog(base_path, enrich=compile_case, pack=open_case_pack()).lookup(keyword)
 
 
-def load_case_by_keyword(keyword: str, base_path="data/history_based") -> dict | None:
+def search_cases(query: str, k: int = 10, base_path="data/history_based") -> list:
     """
-    Searches all cases in history_based for a keyword match in filename or case_id.
-    Supports partial keywords like '002', 'herpes', 'mi'.
+    Ranked fuzzy search for station pickers (trigram index, best first).
 
     Returns:
-        dict or None
-    """
-    keyword = keyword.strip().lower()
-
-    for root, dirs, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".json"):
-                try:
-                    path = os.path.join(root, file)
-                    with open(path, "r", encoding="utf-8") as f:
-                        case = json.load(f)
-
-                    file_match = keyword in file.lower()
-                    id_match = keyword in case.get("case_id", "").lower()
-                    name_match = keyword in case.get(
-                        "station_name", "").lower()
-                    diag_match = keyword in case.get("diagnosis", "").lower()
-
-                    if file_match or id_match or name_match or diag_match:
-                        case["file_path"] = path
-                        return case
-                except Exception as e:
-                    print(f"❌ Error reading {file}: {e}")
-                    continue
-    return None
+        list: Up to k case summaries with a "score" field
+    """
+    return get_catalog(base_path, enrich=compile_case, pack=open_case_pack()).search(query, k)
+
+
+def warm_case_catalog(base_path="data/history_based"):
+    """
+    Builds the case catalog and risk factor store up front
+    (called once at server startup).
+    """
+    pack = open_case_pack()
+    catalog = get_catalog(base_path, enrich=compile_case, pack=pack)
+    risk_factors = get_risk_factor_store(pack=pack)
+    print(f"📚 Case catalog ready: {len(catalog)} case(s) from {base_path}, "
+          f"{len(risk_factors)} risk factor set(s)")
+    return catalog
+
+
+def start_case_watcher(base_path="data/history_based", interval: float = DEFAULT_POLL_INTERVAL):
+    """
+    Starts a background watcher that hot-reloads edited case and
+    risk factor files. Returns None when interval <= 0 (watching disabled).
+    """
+    if interval <= 0:
+        return None
+    pack = open_case_pack()
+    catalog = get_catalog(base_path, enrich=compile_case, pack=pack)
+    risk_factors = get_risk_factor_store(pack=pack)
+    return CaseWatcher([catalog, risk_factors], interval=interval).start()
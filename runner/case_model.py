@@ -0,0 +1,233 @@
+# ============================================
+# 🧾 CASE MODEL MODULE
+# Immutable, validated case object built once when the catalog loads.
+# Precomputes the joined strings and fact blocks the prompt builders
+# need, so a patient turn only reads attributes.
+# ============================================
+
+import os
+from types import MappingProxyType
+
+
+class CaseValidationError(ValueError):
+    """Raised when a case JSON is missing required fields or has bad types."""
+
+
+# ============================================
+# 🧊 Freezing Helpers
+# ============================================
+
+def _freeze(value):
+    """Recursively turns lists into tuples and dicts into read-only mappings."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Inverse of _freeze, for callers that need a plain mutable dict."""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _text_list(data: dict, field: str) -> tuple:
+    value = data.get(field)
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise CaseValidationError(f"'{field}' must be a list of strings")
+    return tuple(value)
+
+
+def _text_map(data: dict, field: str) -> MappingProxyType:
+    value = data.get(field)
+    if value is None:
+        return MappingProxyType({})
+    if not isinstance(value, dict):
+        raise CaseValidationError(f"'{field}' must be an object")
+    return _freeze(value)
+
+
+# ============================================
+# 🧾 CASE
+# ============================================
+
+
+class Case:
+    """
+    Read-only UKMLA case.
+
+    Raw JSON keys stay reachable through get() / case["key"], so code
+    written against the old dicts keeps working. Attributes hold typed
+    values and the prompt blocks precomputed in from_dict().
+    """
+
+    __slots__ = (
+        # 📄 Core fields
+        "case_id", "station_id", "station_name", "category", "sub_category",
+        "name", "age", "gender", "diagnosis", "file_path",
+        "presenting_complaint", "symptoms", "red_flags", "differentials",
+        "medical_history", "medications", "family_history", "closure_lines",
+        "tags", "social_history", "ice", "exam_findings",
+        "investigation_findings", "ending_cue",
+        # 🧮 Precomputed prompt text
+        "symptoms_text", "concern_text", "family_history_text",
+        "patient_facts", "examiner_case_details", "examiner_case_summary",
+        # 🗃️ Frozen raw JSON
+        "_data",
+    )
+
+    def __init__(self, **fields):
+        for slot in self.__slots__:
+            object.__setattr__(self, slot, fields[slot])
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Case objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Case objects are immutable")
+
+    def __repr__(self) -> str:
+        return f"Case({self.case_id!r})"
+
+    # ----------------------------------------
+    # 🗃️ Dict-style access to the raw JSON
+    # ----------------------------------------
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def keys(self):
+        return self._data.keys()
+
+    def to_dict(self) -> dict:
+        """Returns a plain, mutable copy of the case JSON."""
+        return _thaw(self._data)
+
+    # ----------------------------------------
+    # 🏗️ Build + Validate + Precompute
+    # ----------------------------------------
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Case":
+        """
+        Validates an (already enriched) case dict and freezes it.
+
+        Raises:
+            CaseValidationError: If required fields are missing or malformed
+        """
+        if not isinstance(data, dict):
+            raise CaseValidationError("case must be a JSON object")
+        case_id = data.get("case_id")
+        if not isinstance(case_id, str) or not case_id.strip():
+            raise CaseValidationError("'case_id' is required")
+
+        file_path = data.get("file_path") or ""
+        name = data.get("name") or "the patient"
+        age = data.get("age", "40")
+        presenting = _text_list(data, "presenting_complaint")
+        symptoms = _text_list(data, "symptoms")
+        red_flags = _text_list(data, "red_flags")
+        differentials = _text_list(data, "differentials")
+        medical_history = _text_list(data, "medical_history")
+        medications = _text_list(data, "medications")
+        family_history = _text_list(data, "family_history")
+        social = _text_map(data, "social_history")
+        ice = _text_map(data, "ice")
+        exam_findings = data.get("exam_findings", "N/A")
+        investigation_findings = data.get("investigation_findings", "N/A")
+
+        symptoms_text = ", ".join(symptoms)
+        concern_text = " ".join(presenting) or "some issue"
+        family_history_text = ", ".join(family_history) or "None known"
+        smoking = social.get("smoking", "N/A")
+        alcohol = social.get("alcohol", "N/A")
+        diet = social.get("diet", "N/A")
+        exercise = social.get("exercise", "N/A")
+
+        patient_facts = (
+            f"• Smoking: {smoking}\n"
+            f"• Alcohol: {alcohol}\n"
+            f"• Diet: {diet}\n"
+            f"• Exercise: {exercise}\n"
+            f"• Family History: {family_history_text}"
+        )
+
+        examiner_case_details = (
+            f"- Station: {data.get('station_name', 'N/A')}\n"
+            f"- Diagnosis: {data.get('diagnosis', 'N/A')}\n"
+            f"- Presenting Complaint: {' '.join(presenting) or 'N/A'}\n"
+            f"- Symptoms: {symptoms_text}\n"
+            f"- Red Flags: {', '.join(red_flags)}\n"
+            f"- Differentials: {', '.join(differentials)}\n"
+            f"- PMH: {', '.join(medical_history)}\n"
+            f"- Medications: {', '.join(medications)}\n"
+            f"- Family History: {', '.join(family_history)}\n"
+            f"- Social History: Smoking: {smoking}, Alcohol: {alcohol}, Diet: {diet}, Exercise: {exercise}\n"
+            f"- ICE: Ideas: {ice.get('ideas', '')} | Concerns: {ice.get('concerns', '')} | Expectations: {ice.get('expectations', '')}\n"
+            f"- Exam Findings: {exam_findings}\n"
+            f"- Investigation Findings: {investigation_findings}"
+        )
+
+        examiner_case_summary = (
+            f"CASE: {data.get('station_name', 'unknown')}\n"
+            f"DIAGNOSIS: {data.get('diagnosis')}\n"
+            f"SYMPTOMS: {symptoms_text}\n"
+            f"RED FLAGS: {', '.join(red_flags)}\n"
+            f"ICE: Ideas: {ice.get('ideas', '')} | Concerns: {ice.get('concerns', '')} | Expectations: {ice.get('expectations', '')}\n"
+            f"PMH: {', '.join(medical_history)}\n"
+            f"FHx: {', '.join(family_history)}\n"
+            f"SHx: Smoking: {smoking}, Alcohol: {alcohol}, Diet: {diet}, Exercise: {exercise}"
+        )
+
+        return cls(
+            case_id=case_id,
+            station_id=os.path.splitext(os.path.basename(file_path))[0] if file_path else case_id,
+            station_name=data.get("station_name", ""),
+            category=data.get("category", ""),
+            sub_category=data.get("sub_category", ""),
+            name=name,
+            age=age,
+            gender=data.get("gender", ""),
+            diagnosis=data.get("diagnosis", ""),
+            file_path=file_path,
+            presenting_complaint=presenting,
+            symptoms=symptoms,
+            red_flags=red_flags,
+            differentials=differentials,
+            medical_history=medical_history,
+            medications=medications,
+            family_history=family_history,
+            closure_lines=_text_list(data, "closure_lines"),
+            tags=_text_list(data, "tags"),
+            social_history=social,
+            ice=ice,
+            exam_findings=exam_findings,
+            investigation_findings=investigation_findings,
+            ending_cue=data.get("ending_cue", ""),
+            symptoms_text=symptoms_text,
+            concern_text=concern_text,
+            family_history_text=family_history_text,
+            patient_facts=patient_facts,
+            examiner_case_details=examiner_case_details,
+            examiner_case_summary=examiner_case_summary,
+            _data=_freeze(data),
+        )
+
+
+def as_case(case) -> Case:
+    """Accepts a Case or a raw case dict and returns a Case."""
+    return case if isinstance(case, Case) else Case.from_dict(case)
@@ -0,0 +1,190 @@
+# ============================================
+# 📦 CASE PACK MODULE
+# Compiles the case library into one binary file with an offset table
+# and memory-maps it, so uvicorn workers share the same pages and only
+# decode the case that is actually requested.
+#
+# Build:  python -m runner.case_pack --out data/cases.pack
+# Use:    set UKMLA_CASE_PACK=data/cases.pack before starting uvicorn
+# ============================================
+
+import os
+import json
+import mmap
+import struct
+import argparse
+import threading
+from runner.case_catalog import case_fields
+
+# ============================================
+# 🧱 Binary Layout
+#
+#   header   8s magic | I record count | I index block length
+#   offsets  count × (Q offset, I length)   — absolute file offsets
+#   index    UTF-8 JSON list, one entry per record:
+#            [section, path, [mtime_ns, size], {field: [text, ...]}]
+#   data     UTF-8 JSON bytes of each case, back to back
+# ============================================
+
+PACK_MAGIC = b"UKCPACK2"   # bump whenever the index entry shape changes
+HEADER = struct.Struct("<8sII")
+OFFSET = struct.Struct("<QI")
+
+DEFAULT_SECTIONS = ("data/history_based", "data/risk_factors")
+
+# ============================================
+# 🏗️ BUILD STEP
+# ============================================
+
+
+def _iter_json_files(base_dir: str):
+    for root, dirs, files in os.walk(base_dir):
+        dirs.sort()
+        for file in sorted(files):
+            if file.endswith(".json"):
+                yield os.path.join(root, file)
+
+
+def build_case_pack(out_path: str, sections=DEFAULT_SECTIONS) -> int:
+    """
+    Compiles every JSON file under each section folder into a pack.
+
+    Args:
+        out_path (str): Where to write the pack (replaced atomically)
+        sections (tuple): Folders to include, e.g. "data/history_based"
+
+    Returns:
+        int: Number of records written
+    """
+    index, blobs = [], []
+    for section in sections:
+        for path in _iter_json_files(section):
+            try:
+                st = os.stat(path)
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"❌ Skipping {path}: {e}")
+                continue
+
+            fields = {}
+            if isinstance(data, dict) and "case_id" in data:
+                fields = case_fields(data, os.path.basename(path))
+
+            index.append([section, path, [st.st_mtime_ns, st.st_size], fields])
+            blobs.append(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    index_bytes = json.dumps(index, ensure_ascii=False).encode("utf-8")
+    offset = HEADER.size + OFFSET.size * len(blobs) + len(index_bytes)
+
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(PACK_MAGIC, len(blobs), len(index_bytes)))
+        for blob in blobs:
+            f.write(OFFSET.pack(offset, len(blob)))
+            offset += len(blob)
+        f.write(index_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, out_path)
+
+    print(f"📦 Case pack written: {out_path} ({len(blobs)} record(s))")
+    return len(blobs)
+
+# ============================================
+# 🗺️ MEMORY-MAPPED LOADER
+# ============================================
+
+
+class CasePack:
+    """
+    Read-only view over a compiled case pack.
+
+    Only the header, offset table and index block are parsed up front;
+    case bodies stay in the shared mapping until load() is called.
+    """
+
+    def __init__(self, path: str):
+        self.pack_path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, index_len = HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a case pack")
+
+        self._offsets = [
+            OFFSET.unpack_from(self._mm, HEADER.size + i * OFFSET.size)
+            for i in range(count)
+        ]
+        index_start = HEADER.size + OFFSET.size * count
+        self._index = json.loads(self._mm[index_start:index_start + index_len])
+        if any(len(entry) != 4 or not isinstance(entry[3], dict) for entry in self._index):
+            self._mm.close()
+            raise ValueError(f"{path} has an outdated index layout — rebuild the pack")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def section(self, section: str) -> list:
+        """Returns record numbers stored under a section folder."""
+        return [i for i, entry in enumerate(self._index) if entry[0] == section]
+
+    def path(self, i: int) -> str:
+        return self._index[i][1]
+
+    def stat(self, i: int) -> tuple:
+        return tuple(self._index[i][2])
+
+    def fields(self, i: int) -> dict:
+        return self._index[i][3]
+
+    def load(self, i: int):
+        """Decodes one record from the mapping into a fresh object."""
+        offset, length = self._offsets[i]
+        return json.loads(self._mm[offset:offset + length])
+
+    def close(self):
+        self._mm.close()
+
+# ============================================
+# 🌍 Shared Pack (opened once per process)
+# ============================================
+
+
+_PACK = None
+_PACK_FAILED = set()
+_PACK_LOCK = threading.Lock()
+
+
+def open_case_pack(path: str | None = None) -> CasePack | None:
+    """
+    Opens the pack named by UKMLA_CASE_PACK (or path), once per process.
+    Returns None when no pack is configured or it cannot be opened.
+    """
+    global _PACK
+    path = path or os.getenv("UKMLA_CASE_PACK")
+    if not path or path in _PACK_FAILED:
+        return None
+    if _PACK is None or _PACK.pack_path != path:
+        with _PACK_LOCK:
+            if _PACK is None or _PACK.pack_path != path:
+                try:
+                    _PACK = CasePack(path)
+                except Exception as e:
+                    print(f"⚠️ Case pack unavailable ({path}): {e}")
+                    _PACK_FAILED.add(path)
+                    return None
+    return _PACK
+
+# ============================================
+# ✅ CLI ENTRY
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile case JSON into a memory-mappable pack.")
+    parser.add_argument("--out", default="data/cases.pack")
+    parser.add_argument("sections", nargs="*", default=list(DEFAULT_SECTIONS))
+    args = parser.parse_args()
+    build_case_pack(args.out, tuple(args.sections))
@@ -0,0 +1,128 @@
+# ============================================
+# 🔎 CASE SEARCH MODULE
+# Trigram index over case ids, station names, diagnoses, tags and
+# file names, returning a ranked top-k list for station pickers
+# ============================================
+
+import re
+import heapq
+
+# ============================================
+# ⚖️ Field Weights
+# A hit in the case id or station name counts for more than a tag
+# ============================================
+
+FIELD_WEIGHTS = {
+    "case_id": 1.0,
+    "station_name": 1.0,
+    "diagnosis": 0.9,
+    "tags": 0.8,
+    "file_name": 0.6,
+}
+
+EXACT_BONUS = 1.0
+PREFIX_BONUS = 0.5
+SUBSTRING_BONUS = 0.25
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases and turns punctuation / underscores into single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str) -> set:
+    """
+    Returns the padded trigrams of normalized text.
+    Padding lets 1–2 letter queries like "mi" still produce grams.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# ============================================
+# 🧮 TRIGRAM INDEX
+# ============================================
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram to the (path, field, text) entries that
+    contain it. Entries are scored by weighted Jaccard similarity plus
+    small bonuses for exact, prefix and substring hits.
+    """
+
+    __slots__ = ("postings", "entries")
+
+    def __init__(self, postings=None, entries=None):
+        self.postings = postings if postings is not None else {}
+        self.entries = entries if entries is not None else {}
+
+    def copy(self) -> "TrigramIndex":
+        return TrigramIndex(
+            {gram: set(keys) for gram, keys in self.postings.items()},
+            dict(self.entries),
+        )
+
+    def add(self, path: str, fields: dict):
+        """
+        Args:
+            path (str): Case file path (the result key)
+            fields (dict): {field: [text, ...]} for fields in FIELD_WEIGHTS
+        """
+        entries = []
+        for field, texts in fields.items():
+            if field not in FIELD_WEIGHTS:
+                continue
+            for text in texts:
+                norm = normalize_text(text)
+                if not norm:
+                    continue
+                grams = trigrams(norm)
+                key = (path, len(entries))
+                entries.append((field, norm, len(grams)))
+                for gram in grams:
+                    self.postings.setdefault(gram, set()).add(key)
+        self.entries[path] = tuple(entries)
+
+    def remove(self, path: str):
+        entries = self.entries.pop(path, ())
+        for slot, (_, norm, _) in enumerate(entries):
+            key = (path, slot)
+            for gram in trigrams(norm):
+                keys = self.postings.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[gram]
+
+    def search(self, query: str, k: int = 10) -> list:
+        """
+        Returns up to k (score, path) pairs, best first.
+        """
+        norm = normalize_text(query)
+        if not norm or k <= 0:
+            return []
+        query_grams = trigrams(norm)
+
+        shared = {}
+        for gram in query_grams:
+            for key in self.postings.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        best = {}
+        for (path, slot), hits in shared.items():
+            field, text, gram_count = self.entries[path][slot]
+            score = hits / (len(query_grams) + gram_count - hits)
+            if text == norm:
+                score += EXACT_BONUS
+            elif text.startswith(norm) or f" {norm}" in text:
+                score += PREFIX_BONUS
+            elif norm in text:
+                score += SUBSTRING_BONUS
+            score *= FIELD_WEIGHTS[field]
+            if score > best.get(path, 0.0):
+                best[path] = score
+
+        top = heapq.nsmallest(k, ((-score, path) for path, score in best.items()))
+        return [(round(-neg, 4), path) for neg, path in top]
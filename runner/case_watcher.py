@@ -0,0 +1,124 @@
+# ============================================
+# 👀 CASE WATCHER MODULE
+# Polls case folders for added / edited / removed JSON files
+# and pushes only those files into the in-memory stores
+# ============================================
+
+import os
+import threading
+
+# ============================================
+# ⚙️ Watcher Settings
+# ============================================
+
+DEFAULT_POLL_INTERVAL = float(os.getenv("UKMLA_CASE_WATCH_INTERVAL", "2.0"))
+
+# ============================================
+# 👀 CASE WATCHER
+# ============================================
+
+
+class CaseWatcher:
+    """
+    Background mtime poller for case stores.
+
+    A source is any object with:
+        scan_stats()            -> {path: (mtime_ns, size)} on disk now
+        file_stats()            -> {path: (mtime_ns, size)} currently cached
+        apply_changes(changed, removed) -> list of paths that failed to parse
+
+    A file is only reparsed once its (mtime, size) has been the same for
+    two polls in a row, so an editor that is still writing it is never
+    picked up mid-save. Files that fail to parse keep their old version
+    and are retried only after they change again.
+
+    Args:
+        sources (list): Stores to keep in sync
+        interval (float): Seconds between polls
+        settle (bool): Wait one extra poll for files to stop changing
+    """
+
+    def __init__(self, sources, interval: float = DEFAULT_POLL_INTERVAL, settle: bool = True):
+        self.sources = list(sources)
+        self.interval = interval
+        self.settle = settle
+        self._pending = {}   # path -> stat seen on the previous poll
+        self._failed = {}    # path -> stat that last failed to parse
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+
+    def add_source(self, source):
+        self.sources.append(source)
+
+    # ----------------------------------------
+    # 🔁 One Poll
+    # ----------------------------------------
+
+    def poll_once(self) -> int:
+        """
+        Checks every source once.
+
+        Returns:
+            int: Number of files reloaded or removed
+        """
+        applied = 0
+        for source in self.sources:
+            on_disk = source.scan_stats()
+            cached = source.file_stats()
+
+            changed = {}
+            for path, stat in on_disk.items():
+                if cached.get(path) == stat or self._failed.get(path) == stat:
+                    continue
+                if self.settle and self._pending.get(path) != stat:
+                    self._pending[path] = stat
+                    continue
+                self._pending.pop(path, None)
+                changed[path] = stat
+
+            removed = [path for path in cached if path not in on_disk]
+            for path in removed:
+                self._pending.pop(path, None)
+                self._failed.pop(path, None)
+
+            if not changed and not removed:
+                continue
+
+            failed = source.apply_changes(changed, removed)
+            for path in changed:
+                if path in failed:
+                    self._failed[path] = changed[path]
+                else:
+                    self._failed.pop(path, None)
+            applied += len(changed) - len(failed) + len(removed)
+
+        if applied:
+            self.reloads += applied
+            print(f"🔄 Case watcher reloaded {applied} file(s)")
+        return applied
+
+    # ----------------------------------------
+    # 🧵 Background Thread
+    # ----------------------------------------
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"⚠️ Case watcher error: {e}")
+
+    def start(self) -> "CaseWatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="case-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
@@ -0,0 +1,164 @@
+# ============================================
+# 🧠 CONVERSATION MEMORY
+# Keeps the last N turns verbatim, folds older turns into a compact
+# rolling summary and tracks which case facts were already disclosed,
+# all inside a fixed token budget so prompts stay flat over a station
+# ============================================
+
+import os
+import re
+import json
+import hashlib
+from collections import deque
+
+# ============================================
+# ⚙️ Memory Settings
+# ============================================
+
+MEMORY_MAX_TURNS = int(os.getenv("UKMLA_MEMORY_TURNS", "6"))
+MEMORY_TOKEN_BUDGET = int(os.getenv("UKMLA_MEMORY_TOKEN_BUDGET", "600"))
+SUMMARY_LINE_CHARS = 120
+CHARS_PER_TOKEN = 4   # rough estimate, good enough for budgeting
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"with", "from", "that", "this", "have", "been", "after", "before", "when", "into", "side"}
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _fact_words(fact: str) -> frozenset:
+    return frozenset(w for w in _WORD.findall(fact.lower()) if len(w) > 3 and w not in _STOPWORDS)
+
+# ============================================
+# 🧠 CONVERSATION MEMORY
+# ============================================
+
+
+class ConversationMemory:
+    """
+    Bounded per-session conversation history.
+
+    Args:
+        max_turns (int): Turns kept verbatim
+        token_budget (int): Cap for verbatim turns + summary + facts
+    """
+
+    __slots__ = ("turns", "summary", "disclosed_facts", "max_turns", "token_budget")
+
+    def __init__(self, max_turns: int = MEMORY_MAX_TURNS, token_budget: int = MEMORY_TOKEN_BUDGET):
+        self.turns = deque()           # (doctor, patient)
+        self.summary = deque()         # one short line per folded turn
+        self.disclosed_facts = []      # case facts the patient has revealed
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+
+    def __len__(self) -> int:
+        return len(self.turns) + len(self.summary)
+
+    # ----------------------------------------
+    # ➕ Recording
+    # ----------------------------------------
+
+    def add_turn(self, doctor: str, patient: str, facts=()):
+        """
+        Records one exchange.
+
+        Args:
+            doctor (str): What the doctor said
+            patient (str): What the patient replied
+            facts (iterable): Case facts (e.g. symptoms) to check the reply against
+        """
+        self.turns.append((doctor, patient))
+        self._note_disclosed(patient, facts)
+        while len(self.turns) > self.max_turns:
+            self._fold_oldest()
+        self._enforce_budget()
+
+    def _note_disclosed(self, patient: str, facts):
+        said = set(_WORD.findall(patient.lower()))
+        for fact in facts:
+            if fact in self.disclosed_facts:
+                continue
+            words = _fact_words(fact)
+            if words and len(words & said) * 2 >= len(words):
+                self.disclosed_facts.append(fact)
+
+    def _fold_oldest(self):
+        doctor, patient = self.turns.popleft()
+        self.summary.append(_shorten(
+            f"Doctor: {doctor} / You: {patient}", SUMMARY_LINE_CHARS))
+
+    def token_count(self) -> int:
+        total = sum(estimate_tokens(d) + estimate_tokens(p) for d, p in self.turns)
+        total += sum(estimate_tokens(line) for line in self.summary)
+        total += sum(estimate_tokens(fact) for fact in self.disclosed_facts)
+        return total
+
+    def _enforce_budget(self):
+        # Fold verbatim turns first (keep at least the latest), then drop
+        # the oldest summary lines
+        while self.token_count() > self.token_budget and len(self.turns) > 1:
+            self._fold_oldest()
+        while self.token_count() > self.token_budget and self.summary:
+            self.summary.popleft()
+
+    def clear(self):
+        self.turns.clear()
+        self.summary.clear()
+        self.disclosed_facts.clear()
+
+    def to_state(self) -> dict:
+        return {
+            "turns": [list(turn) for turn in self.turns],
+            "summary": list(self.summary),
+            "disclosed_facts": list(self.disclosed_facts),
+            "max_turns": self.max_turns,
+            "token_budget": self.token_budget,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "ConversationMemory":
+        memory = cls(state["max_turns"], state["token_budget"])
+        memory.turns.extend(tuple(turn) for turn in state["turns"])
+        memory.summary.extend(state["summary"])
+        memory.disclosed_facts.extend(state["disclosed_facts"])
+        return memory
+
+    # ----------------------------------------
+    # 📝 Prompt Pieces
+    # ----------------------------------------
+
+    def history_messages(self) -> list:
+        """Verbatim recent turns as chat messages."""
+        messages = []
+        for doctor, patient in self.turns:
+            messages.append({"role": "user", "content": doctor})
+            messages.append({"role": "assistant", "content": patient})
+        return messages
+
+    def recap(self) -> str:
+        """Rolling summary + disclosed facts for the per-turn prompt."""
+        parts = []
+        if self.summary:
+            parts.append("Earlier in this consultation:\n" + "\n".join(f"- {line}" for line in self.summary))
+        if self.disclosed_facts:
+            parts.append("You have already told the doctor: " + "; ".join(self.disclosed_facts))
+        return "\n".join(parts)
+
+    def digest(self) -> str:
+        """
+        Short hash of everything this memory puts into the prompt, so
+        reply cache entries only match the same conversation state.
+        "" while the memory is empty.
+        """
+        if not self:
+            return ""
+        raw = json.dumps([list(self.turns), self.recap()], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,255 @@
+# ============================================
+# 📼 TURN EVENT LOG
+# Append-only JSONL record of every turn (timestamps, transcript, reply,
+# stage latencies). Handlers only enqueue; a background writer thread
+# batches events and commits each batch with one write + fsync, so the
+# request path never touches the disk. Replay: replay_session.py
+# ============================================
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# ============================================
+# ⚙️ Event Log Settings
+# ============================================
+
+EVENT_LOG_PATH = os.getenv("UKMLA_EVENT_LOG", "data/events/turns.jsonl")   # "" disables
+EVENT_LOG_FLUSH_MS = float(os.getenv("UKMLA_EVENT_LOG_FLUSH_MS", "50"))     # max batching delay
+EVENT_LOG_MAX_BATCH = int(os.getenv("UKMLA_EVENT_LOG_MAX_BATCH", "256"))
+EVENT_LOG_MAX_QUEUE = int(os.getenv("UKMLA_EVENT_LOG_MAX_QUEUE", "10000"))
+EVENT_LOG_FSYNC = os.getenv("UKMLA_EVENT_LOG_FSYNC", "1") == "1"
+
+# O_BINARY: no "\r\n" translation on Windows
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+EVENT_TURN = "turn"     # one doctor line + patient reply
+EVENT_RESET = "reset"   # station over (feedback given, session reset)
+
+# ============================================
+# ⏱️ Stage Timer
+# ============================================
+
+
+class TurnTimer:
+    """
+    Collects per-stage latencies (ms) for one turn.
+
+        timer = TurnTimer()
+        with timer.stage("stt"):
+            ...
+        timer.mark("first_token_ms")   # ms since the timer started
+    """
+
+    __slots__ = ("started_at", "_started", "latencies")
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self.latencies = {}
+
+    def elapsed_ms(self) -> float:
+        return round((time.monotonic() - self._started) * 1000, 1)
+
+    def mark(self, name: str):
+        self.latencies.setdefault(name, self.elapsed_ms())
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.latencies[f"{name}_ms"] = round((time.monotonic() - started) * 1000, 1)
+
+    async def first_chunk(self, chunks, name: str = "first_token_ms"):
+        """Passes an async stream through, marking when its first chunk arrives."""
+        async for chunk in chunks:
+            self.mark(name)
+            yield chunk
+
+    def finish(self) -> dict:
+        self.latencies["total_ms"] = self.elapsed_ms()
+        return self.latencies
+
+# ============================================
+# ✍️ Group-Commit Writer
+# ============================================
+
+
+class EventLogWriter:
+    """
+    Buffered, append-only JSONL writer.
+
+    append() is a lock + deque push and never blocks on I/O. The writer
+    thread wakes on the first event, waits up to `flush_ms` for more
+    (or until `max_batch`), then serializes and commits the whole batch
+    in one write/fsync. When the queue is full new events are dropped
+    and counted rather than stalling a request.
+
+    Args:
+        path (str): JSONL file, created (with parent dirs) on first write
+        flush_ms (float): Longest an event waits to be batched
+        max_batch (int): Events per commit
+        max_queue (int): Pending events before dropping
+        fsync (bool): fsync after each batch (durable group commit)
+    """
+
+    def __init__(self, path: str = EVENT_LOG_PATH, flush_ms: float = EVENT_LOG_FLUSH_MS,
+                 max_batch: int = EVENT_LOG_MAX_BATCH, max_queue: int = EVENT_LOG_MAX_QUEUE,
+                 fsync: bool = EVENT_LOG_FSYNC):
+        self.path = path
+        self.flush_ms = flush_ms
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.fsync = fsync
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self.commit_ms_total = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._thread.start()
+
+    def append(self, event: dict) -> bool:
+        """Queues one event; returns False if it was dropped."""
+        if not self.enabled:
+            return False
+        with self._cond:
+            if self._closed or len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self._ensure_thread()
+            self._pending.append(event)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        return True
+
+    def _take_batch(self) -> list:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            # 🧺 Let a burst accumulate, so many turns share one commit
+            deadline = time.monotonic() + self.flush_ms / 1000
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._pending), self.max_batch)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _commit(self, batch: list):
+        started = time.monotonic()
+        data = "".join(json.dumps(e, ensure_ascii=False, separators=(",", ":")) + "\n" for e in batch)
+        data = memoryview(data.encode("utf-8"))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One write() on an O_APPEND fd: several workers sharing the file
+        # append whole batches instead of interleaving buffered chunks
+        fd = os.open(self.path, _APPEND_FLAGS, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.written += len(batch)
+        self.batches += 1
+        self.commit_ms_total += (time.monotonic() - started) * 1000
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                try:
+                    self._commit(batch)
+                except (OSError, TypeError, ValueError) as e:
+                    self.errors += 1
+                    print(f"⚠️ Event log write failed ({len(batch)} events lost): {e}")
+            elif self._closed:
+                return
+
+    def close(self, timeout: float = 5.0):
+        """Flushes everything still queued, then stops the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "pending": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 2) if self.batches else 0.0,
+            "avg_commit_ms": round(self.commit_ms_total / self.batches, 2) if self.batches else 0.0,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+# ============================================
+# 📖 Reading
+# ============================================
+
+
+def read_events(path: str = EVENT_LOG_PATH, session_id: str | None = None):
+    """Yields logged events in append order (optionally for one session)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue   # torn last line after a crash
+            if session_id is None or event.get("session_id") == session_id:
+                yield event
+
+# ============================================
+# 🌍 Shared Log
+# ============================================
+
+EVENT_LOG = EventLogWriter()
+
+
+def log_turn(session, case, phase: str, endpoint: str, doctor: str, reply: str, timer: TurnTimer):
+    EVENT_LOG.append({
+        "type": EVENT_TURN,
+        "ts": timer.started_at,
+        "session_id": session.session_id,
+        "case_id": getattr(case, "case_id", None),
+        "phase": phase,
+        "endpoint": endpoint,
+        "doctor": doctor,
+        "reply": reply,
+        "mood": session.memory.patient_mood,
+        "latency_ms": timer.finish(),
+    })
+
+
+def log_reset(session, case=None):
+    EVENT_LOG.append({
+        "type": EVENT_RESET,
+        "ts": time.time(),
+        "session_id": session.session_id,
+        "case_id": getattr(case, "case_id", None),
+    })
@@ -0,0 +1,186 @@
+# ============================================
+# 🧵 BLOCKING CALL EXECUTOR
+# One named, bounded thread pool for blocking work (mic STT, audio
+# playback, file I/O) with a concurrency cap per call site, so one slow
+# dependency cannot take every worker — plus queue/wait metrics
+# ============================================
+
+import os
+import time
+import asyncio
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# ============================================
+# ⚙️ Executor Settings
+# ============================================
+
+EXECUTOR_WORKERS = int(os.getenv("UKMLA_EXECUTOR_WORKERS", "8"))
+# "site=cap,site=cap" — sites not listed may use every worker
+DEFAULT_SITE_LIMITS = "stt=2,audio=2,file_io=4,llm=4"
+
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def parse_site_limits(spec: str) -> dict:
+    limits = {}
+    for item in spec.split(","):
+        name, _, cap = item.strip().partition("=")
+        if name and cap.strip().isdigit():
+            limits[name] = int(cap)
+    return limits
+
+# ============================================
+# 📊 Per-Site Stats
+# ============================================
+
+
+class _SiteStats:
+    __slots__ = ("limit", "semaphore", "calls", "waiting", "running",
+                 "errors", "wait_total", "run_total", "wait_histogram")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = None   # asyncio.Semaphore, created on the running loop
+        self.calls = 0
+        self.waiting = 0
+        self.running = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, seconds: float):
+        self.wait_total += seconds
+        ms = seconds * 1000
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if ms <= bound:
+                self.wait_histogram[i] += 1
+                return
+        self.wait_histogram[-1] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "calls": self.calls,
+            "waiting": self.waiting,
+            "running": self.running,
+            "errors": self.errors,
+            "avg_wait_ms": round(self.wait_total / self.calls * 1000, 2) if self.calls else 0.0,
+            "avg_run_ms": round(self.run_total / self.calls * 1000, 2) if self.calls else 0.0,
+            "wait_histogram_ms": {
+                **{f"<={b}": n for b, n in zip(WAIT_BUCKETS_MS, self.wait_histogram)},
+                f">{WAIT_BUCKETS_MS[-1]}": self.wait_histogram[-1],
+            },
+        }
+
+# ============================================
+# 🧵 BLOCKING EXECUTOR
+# ============================================
+
+
+class BlockingExecutor:
+    """
+    Runs blocking callables on a dedicated pool from async code.
+
+    A call first waits for its site's slot (asyncio semaphore, no thread
+    held while waiting), then for a free worker. Wait time covers both.
+
+    Args:
+        name (str): Thread name prefix (shows up in stack dumps)
+        max_workers (int): Pool size
+        site_limits (dict): {site: max concurrent calls}
+    """
+
+    def __init__(self, name: str = "ukmla-blocking", max_workers: int = EXECUTOR_WORKERS,
+                 site_limits: dict | None = None):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._limits = dict(site_limits if site_limits is not None
+                            else parse_site_limits(os.getenv("UKMLA_EXECUTOR_LIMITS", DEFAULT_SITE_LIMITS)))
+        self._sites = {}
+        self._lock = threading.Lock()
+        self.queued = 0    # submitted to the pool, not yet started
+        self.active = 0    # running on a worker
+
+    def _site(self, site: str) -> _SiteStats:
+        stats = self._sites.get(site)
+        if stats is None:
+            limit = min(self._limits.get(site, self.max_workers), self.max_workers)
+            stats = self._sites.setdefault(site, _SiteStats(limit))
+        if stats.semaphore is None:
+            stats.semaphore = asyncio.Semaphore(stats.limit)
+        return stats
+
+    def _wrap(self, stats: _SiteStats, submitted: float, func):
+        def run():
+            started = time.monotonic()
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                stats.waiting -= 1
+                stats.running += 1
+                stats.observe_wait(started - submitted)
+            try:
+                return func()
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    stats.running -= 1
+                    stats.run_total += time.monotonic() - started
+        return run
+
+    async def run(self, site: str, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) on the pool under the site's cap.
+
+        Args:
+            site (str): Call site name, e.g. "stt", "audio", "file_io"
+        """
+        stats = self._site(site)
+        submitted = time.monotonic()
+        with self._lock:
+            stats.calls += 1
+            stats.waiting += 1
+        try:
+            await stats.semaphore.acquire()
+        except BaseException:
+            with self._lock:
+                stats.waiting -= 1
+            raise
+        try:
+            with self._lock:
+                self.queued += 1
+            call = functools.partial(func, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(
+                self._pool, self._wrap(stats, submitted, call))
+        finally:
+            stats.semaphore.release()
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "active_workers": self.active,
+                "sites": {name: s.snapshot() for name, s in self._sites.items()},
+            }
+
+# ============================================
+# 🌍 Shared Executor
+# ============================================
+
+BLOCKING_EXECUTOR = BlockingExecutor()
+
+
+async def run_blocking(site: str, func, *args, **kwargs):
+    return await BLOCKING_EXECUTOR.run(site, func, *args, **kwargs)
@@ -0,0 +1,157 @@
+# ============================================
+# 🔁 NEAR-DUPLICATE QUESTION INDEX
+# Per-session MinHash/LSH over normalized word shingles, so "do you
+# smoke" and "do you smoke at all" count as the same question even when
+# STT words them differently. Insert + query cost is constant per turn.
+# ============================================
+
+import os
+import re
+import hashlib
+from array import array
+from functools import lru_cache
+
+# ============================================
+# ⚙️ Detector Settings
+# ============================================
+
+DUPLICATE_THRESHOLD = float(os.getenv("UKMLA_DUPLICATE_THRESHOLD", "0.5"))   # shingle Jaccard
+NUM_PERM = 32
+BANDS = 16                     # 16 bands × 2 rows: J=0.5 → ~99% chance of becoming a candidate
+ROWS = NUM_PERM // BANDS
+MAX_BUCKET = 16                # newest questions kept per LSH bucket
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+# Words that carry no meaning for "is this the same question?". Question,
+# quantity and time words ("how much", "ever", "still", "tell me about")
+# stay: they turn "do you smoke" into a different, legitimate follow-up
+STOPWORDS = frozenset("""
+a an the and or but so um uh erm er hmm okay ok right well please doctor just really actually
+at all any anything some is are am was were be been do does did done you u your yours i me my
+we us our to of in on for with it its that this there these those have has had can could would
+will shall should if also again very
+""".split())
+
+_SUFFIXES = ("ing", "ed", "es", "s", "e")
+
+# ============================================
+# 🧩 Shingling + MinHash
+# ============================================
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def shingles(text: str) -> frozenset:
+    """
+    Content-word unigrams + adjacent bigrams of the normalized text.
+    A question made only of stopwords ("is that all?") becomes one
+    whole-phrase shingle, so exact repeats of it still match.
+    """
+    words = [w.replace("'", "") for w in _WORD.findall(text.lower())]
+    content = [_stem(w) for w in words if w and w not in STOPWORDS]
+    if not content:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(content + [f"{a} {b}" for a, b in zip(content, content[1:])])
+
+
+@lru_cache(maxsize=8192)
+def _hashes(shingle: str) -> tuple:
+    # NUM_PERM independent 32-bit hashes from one SHAKE digest; stable
+    # across workers and restarts, unlike hash(). Cached: a station's
+    # questions keep reusing the same few words
+    return tuple(array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(NUM_PERM * 4)))
+
+
+def signature(shingle_set: frozenset) -> tuple:
+    return tuple(map(min, zip(*map(_hashes, shingle_set))))
+
+
+def band_keys(sig: tuple) -> list:
+    return [(band, *sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def fingerprint(text: str) -> tuple:
+    """(shingles, LSH band keys) of one question."""
+    shingle_set = shingles(text)
+    return shingle_set, band_keys(signature(shingle_set)) if shingle_set else []
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+# ============================================
+# 🗂️ Per-Session Index
+# ============================================
+
+
+class NearDuplicateIndex:
+    """
+    Questions asked so far in one session.
+
+    add() looks the new question up in its LSH buckets, confirms
+    candidates with exact shingle Jaccard, then inserts it. Buckets are
+    capped, so both steps stay O(BANDS × MAX_BUCKET). Stores persist
+    only the questions (to_state); buckets are rebuilt on load.
+    """
+
+    __slots__ = ("threshold", "questions", "shingle_sets", "buckets")
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.questions = []
+        self.shingle_sets = []
+        self.buckets = {}   # band key -> [question index, ...]
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def to_state(self) -> dict:
+        return {"threshold": self.threshold, "questions": list(self.questions)}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "NearDuplicateIndex":
+        index = cls(state["threshold"])
+        for question in state["questions"]:
+            index.add(question)
+        return index
+
+    def add(self, text: str) -> tuple | None:
+        """
+        Records a question.
+
+        Returns:
+            (earlier question, similarity) if it repeats one, else None
+        """
+        shingle_set, keys = fingerprint(text)
+        if not shingle_set:
+            return None
+
+        best, best_score = None, 0.0
+        seen = set()
+        for key in keys:
+            for i in self.buckets.get(key, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                score = jaccard(shingle_set, self.shingle_sets[i])
+                if score > best_score:
+                    best, best_score = i, score
+
+        index = len(self.questions)
+        self.questions.append(text)
+        self.shingle_sets.append(shingle_set)
+        for key in keys:
+            bucket = self.buckets.setdefault(key, [])
+            bucket.append(index)
+            if len(bucket) > MAX_BUCKET:
+                del bucket[0]
+
+        if best is not None and best_score >= self.threshold:
+            return self.questions[best], round(best_score, 2)
+        return None
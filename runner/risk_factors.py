@@ -0,0 +1,164 @@
+# ============================================
+# 🧬 RISK FACTOR STORE
+# Loads data/risk_factors/*.json once, keyed by station id (file stem),
+# so family-history replies need no file I/O on the request path
+# ============================================
+
+import os
+import json
+import threading
+
+# ============================================
+# 🧬 Risk Factors Entry
+# ============================================
+
+
+class RiskFactors:
+    """Precomputed family-history lines for one station."""
+
+    __slots__ = ("station_id", "relevant", "distractors", "options")
+
+    def __init__(self, station_id: str, relevant: tuple, distractors: tuple):
+        self.station_id = station_id
+        self.relevant = relevant
+        self.distractors = distractors
+        self.options = relevant + distractors
+
+    @classmethod
+    def from_dict(cls, station_id: str, data: dict) -> "RiskFactors":
+        if not isinstance(data, dict):
+            raise ValueError("risk factor file must contain a JSON object")
+        relevant = tuple(v for v in data.get("family_relevant", []) if isinstance(v, str))
+        distractors = tuple(v for v in data.get("family_distractors", []) if isinstance(v, str))
+        return cls(station_id, relevant, distractors)
+
+# ============================================
+# 🗄️ RISK FACTOR STORE
+# ============================================
+
+
+class RiskFactorStore:
+    """
+    In-memory {station_id: RiskFactors}. Follows the same source protocol
+    as CaseCatalog (scan_stats / file_stats / apply_changes), so the case
+    watcher can hot-reload it.
+    """
+
+    def __init__(self, base_dir: str = "data/risk_factors"):
+        self.base_dir = base_dir
+        self._entries = {}   # station_id -> RiskFactors
+        self._stats = {}     # path -> (mtime_ns, size)
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, station_id: str) -> RiskFactors | None:
+        return self._entries.get(station_id)
+
+    @staticmethod
+    def station_id_for(path: str) -> str:
+        return os.path.splitext(os.path.basename(path))[0]
+
+    # ----------------------------------------
+    # 🏗️ Building
+    # ----------------------------------------
+
+    def scan_stats(self) -> dict:
+        stats = {}
+        if not os.path.isdir(self.base_dir):
+            return stats
+        for file in sorted(os.listdir(self.base_dir)):
+            if not file.endswith(".json"):
+                continue
+            path = os.path.join(self.base_dir, file)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_mtime_ns, st.st_size)
+        return stats
+
+    def file_stats(self) -> dict:
+        return dict(self._stats)
+
+    def parse_file(self, path: str) -> RiskFactors:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return RiskFactors.from_dict(self.station_id_for(path), data)
+
+    def build(self) -> "RiskFactorStore":
+        return self._replace_all(self.scan_stats(), self.parse_file)
+
+    def build_from_pack(self, pack) -> "RiskFactorStore":
+        """Loads entries from a CasePack section instead of the folder."""
+        records = {pack.path(r): r for r in pack.section(self.base_dir)}
+        stats = {path: pack.stat(r) for path, r in records.items()}
+
+        def parse(path):
+            return RiskFactors.from_dict(self.station_id_for(path), pack.load(records[path]))
+
+        return self._replace_all(stats, parse)
+
+    def _replace_all(self, stats: dict, parse) -> "RiskFactorStore":
+        entries, parsed_stats = {}, {}
+        for path, stat in stats.items():
+            try:
+                entry = parse(path)
+            except Exception as e:
+                print(f"⚠️ Risk factor load error ({os.path.basename(path)}): {e}")
+                continue
+            entries[entry.station_id] = entry
+            parsed_stats[path] = stat
+        with self._write_lock:
+            self._entries, self._stats = entries, parsed_stats
+        return self
+
+    def apply_changes(self, changed: dict, removed=()) -> list:
+        parsed, failed = {}, []
+        for path in changed:
+            try:
+                parsed[path] = self.parse_file(path)
+            except Exception as e:
+                print(f"⚠️ Keeping previous version of {os.path.basename(path)}: {e}")
+                failed.append(path)
+
+        if not parsed and not removed:
+            return failed
+
+        with self._write_lock:
+            entries, stats = dict(self._entries), dict(self._stats)
+            for path in removed:
+                stats.pop(path, None)
+                entries.pop(self.station_id_for(path), None)
+            for path, entry in parsed.items():
+                stats[path] = changed[path]
+                entries[entry.station_id] = entry
+            self._entries, self._stats = entries, stats
+        return failed
+
+# ============================================
+# 🌍 Shared Store
+# ============================================
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_risk_factor_store(base_dir: str = "data/risk_factors", pack=None) -> RiskFactorStore:
+    """
+    Returns the shared store, loading it on first use (from the pack if
+    one is given and holds base_dir).
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                store = RiskFactorStore(base_dir)
+                if pack is not None and pack.section(base_dir):
+                    store.build_from_pack(pack)
+                else:
+                    store.build()
+                _STORE = store
+    return _STORE
@@ -0,0 +1,331 @@
+# ============================================
+# 🗂️ PER-SESSION STATE
+# One Session (patient memory + transcript log) per candidate, looked up
+# by session id, so concurrent stations never share state; sessions live
+# in a pluggable store so several workers/nodes can serve the same one
+# ============================================
+
+import time
+import uuid
+import threading
+from runner.conversation_memory import ConversationMemory
+from runner.near_duplicates import NearDuplicateIndex
+from runner.session_store import SessionStore, SessionSweeper, create_session_store
+from runner.executor import run_blocking
+
+DEFAULT_SESSION_ID = "local"   # CLI scripts only; HTTP routes always require an id
+
+# ============================================
+# 🧠 Patient Memory
+# ============================================
+
+
+class PatientMemory:
+    """
+    What the simulated patient remembers during one station.
+
+    Keeps dict-style access (memory["patient_mood"], .get) so code
+    written against the old PATIENT_MEMORY dict keeps working.
+    """
+
+    __slots__ = (
+        "presenting_complaint", "pain_history", "family_history_father",
+        "family_history_mother", "family_history", "past_medical_history",
+        "past_episode", "allergies", "medications", "smoking_alcohol", "diet",
+        "exercise", "social", "identity", "reassurance",
+        "management_explained", "diagnosis_acknowledged", "concern_asked",
+        "llm_fallback_memory", "last_response", "patient_mood",
+        "diagnosis_explained", "transition_started_at", "ai_fallback_triggered",
+        "conversation",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # 🔁 History slots start empty
+        for key in ("presenting_complaint", "pain_history", "family_history_father",
+                    "family_history_mother", "family_history", "past_medical_history",
+                    "past_episode", "allergies", "medications", "smoking_alcohol", "diet",
+                    "exercise", "social", "identity", "reassurance"):
+            setattr(self, key, None)
+
+        # 🚦 Phase-related status flags
+        self.management_explained = False
+        self.diagnosis_acknowledged = False
+        self.concern_asked = False
+        self.diagnosis_explained = False      # True once student explains diagnosis
+        self.transition_started_at = None     # Timestamp when transition begins
+        self.ai_fallback_triggered = False    # Prevent double fallback responses
+
+        # 🧠 Short-term memory + mood
+        self.llm_fallback_memory = {}
+        self.last_response = ""
+        self.patient_mood = "neutral"
+        self.conversation = ConversationMemory()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_state(self) -> dict:
+        state = {key: getattr(self, key) for key in self.__slots__ if key != "conversation"}
+        state["conversation"] = self.conversation.to_state()
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PatientMemory":
+        memory = cls()
+        for key, value in state.items():
+            if key == "conversation":
+                value = ConversationMemory.from_state(value)
+            if key in memory:
+                setattr(memory, key, value)
+        return memory
+
+# ============================================
+# 📋 Session Log
+# ============================================
+
+
+class SessionLog:
+    """
+    Transcript + tagging for the examiner. Dict-style access matches the
+    old SESSION_LOG dict the examiner prompts read from; question_index
+    (near-duplicate lookup) is internal and left out of keys()/to_dict().
+    """
+
+    FIELDS = ("questions", "duplicate_questions", "question_tags")
+    __slots__ = FIELDS + ("question_index",)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.questions = []
+        self.duplicate_questions = []
+        self.question_tags = {
+            "data_gathering": [],
+            "management": [],
+            "interpersonal": []
+        }
+        self.question_index = NearDuplicateIndex()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def to_state(self) -> dict:
+        state = self.to_dict()
+        state["question_index"] = self.question_index.to_state()
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SessionLog":
+        log = cls()
+        for key in cls.FIELDS:
+            setattr(log, key, state[key])
+        log.question_index = NearDuplicateIndex.from_state(state["question_index"])
+        return log
+
+# ============================================
+# 🎫 Session
+# ============================================
+
+
+class Session:
+    """One candidate's station: patient memory + transcript log."""
+
+    __slots__ = ("session_id", "memory", "log", "created_at", "last_seen")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.memory = PatientMemory()
+        self.log = SessionLog()
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+
+    def touch(self):
+        self.last_seen = time.time()
+
+    def reset(self):
+        self.memory.reset()
+        self.log.reset()
+        self.touch()
+
+    def to_state(self) -> dict:
+        """Plain JSON-ready dict, what the shared session stores persist."""
+        return {
+            "session_id": self.session_id,
+            "created_at": self.created_at,
+            "last_seen": self.last_seen,
+            "memory": self.memory.to_state(),
+            "log": self.log.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "Session":
+        session = cls(state["session_id"])
+        session.created_at = state["created_at"]
+        session.last_seen = state["last_seen"]
+        session.memory = PatientMemory.from_state(state["memory"])
+        session.log = SessionLog.from_state(state["log"])
+        return session
+
+# ============================================
+# 🗄️ Session Registry
+# ============================================
+
+
+class SessionRegistry:
+    """
+    Session lookup on top of a pluggable SessionStore (memory, sqlite,
+    redis — see runner/session_store.py).
+
+    Handlers mutate the Session they got back and call save() once the
+    turn is done; for the memory backend that only refreshes LRU order
+    and size, for shared backends it is what other workers will read.
+
+    The default "local" session is pinned in-process: CLI scripts alias
+    it at import time and must not need a reachable store.
+
+    Async handlers use the a* twins (aget, aget_or_create, asave, …),
+    which move sqlite/redis I/O onto the blocking executor's file_io
+    site; the memory backend is called inline.
+    """
+
+    def __init__(self, store: SessionStore | None = None):
+        self.store = store if store is not None else create_session_store()
+        self._pinned = {}
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def __contains__(self, session_id: str) -> bool:
+        return self._load(session_id) is not None
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def _load(self, session_id: str) -> Session | None:
+        session = self._pinned.get(session_id)
+        return session if session is not None else self.store.get(session_id)
+
+    def create(self, session_id: str | None = None) -> Session:
+        session = Session(session_id or self.new_id())
+        if session.session_id == DEFAULT_SESSION_ID:
+            self._pinned[DEFAULT_SESSION_ID] = session
+        else:
+            self.store.put(session)
+        return session
+
+    def get(self, session_id: str) -> Session | None:
+        session = self._load(session_id)
+        if session is not None:
+            session.touch()
+        return session
+
+    def get_or_create(self, session_id: str | None = None) -> Session:
+        if not session_id:
+            return self.create()
+        session = self._load(session_id)
+        if session is None:
+            with self._lock:
+                session = self._load(session_id)
+                if session is None:
+                    session = self.create(session_id)
+        session.touch()
+        return session
+
+    def save(self, session: Session):
+        session.touch()
+        if session.session_id not in self._pinned:
+            self.store.put(session)
+
+    def drop(self, session_id: str) -> bool:
+        if self._pinned.pop(session_id, None) is not None:
+            return True
+        return self.store.delete(session_id)
+
+    async def _offload(self, func, *args):
+        if not self.store.blocking:
+            return func(*args)
+        return await run_blocking("file_io", func, *args)
+
+    async def acreate(self, session_id: str | None = None) -> Session:
+        return await self._offload(self.create, session_id)
+
+    async def aget(self, session_id: str) -> Session | None:
+        return await self._offload(self.get, session_id)
+
+    async def aget_or_create(self, session_id: str | None = None) -> Session:
+        return await self._offload(self.get_or_create, session_id)
+
+    async def asave(self, session: Session):
+        await self._offload(self.save, session)
+
+    async def adrop(self, session_id: str) -> bool:
+        return await self._offload(self.drop, session_id)
+
+    def start_sweeper(self, interval: float | None = None) -> SessionSweeper:
+        if self._sweeper is None:
+            self._sweeper = SessionSweeper(self.store) if interval is None else SessionSweeper(self.store, interval)
+        return self._sweeper.start()
+
+    def close(self):
+        if self._sweeper is not None:
+            self._sweeper.stop()
+        self.store.close()
+
+    def stats(self) -> dict:
+        stats = self.store.stats()
+        stats["pinned"] = len(self._pinned)
+        if self._sweeper is not None:
+            stats["swept"] = self._sweeper.swept
+        return stats
+
+# ============================================
+# 🌍 Shared Registry
+# ============================================
+
+SESSIONS = SessionRegistry()
+
+
+def get_session(session_id: str | None = DEFAULT_SESSION_ID) -> Session:
+    return SESSIONS.get_or_create(session_id or DEFAULT_SESSION_ID)
+
+
+async def aget_session(session_id: str) -> Session:
+    """
+    get_session() for async handlers. HTTP clients always name their
+    session (POST /sessions); the pinned default is for CLI scripts only.
+    """
+    return await SESSIONS.aget_or_create(session_id)
@@ -0,0 +1,419 @@
+# ============================================
+# 🗄️ SESSION STORES
+# Pluggable backends for per-session state:
+#   memory — in-process LRU + TTL with a hard memory budget
+#   sqlite — on-disk, shared by every worker on one host
+#   redis  — any RESP server (Redis, or resp_standin.py locally),
+#            shared across hosts with no sticky routing
+# Picked with UKMLA_SESSION_BACKEND
+# ============================================
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+# ============================================
+# ⚙️ Store Settings
+# ============================================
+
+SESSION_BACKEND = os.getenv("UKMLA_SESSION_BACKEND", "memory")
+SESSION_TTL = float(os.getenv("UKMLA_SESSION_TTL", "3600"))                 # idle seconds
+SESSION_MEMORY_BUDGET = int(float(os.getenv("UKMLA_SESSION_MEMORY_MB", "64")) * 1024 * 1024)
+SESSION_DB_PATH = os.getenv("UKMLA_SESSION_DB", "data/sessions.sqlite3")
+SESSION_REDIS_URL = os.getenv("UKMLA_REDIS_URL", "redis://127.0.0.1:6379/0")
+SWEEP_INTERVAL = float(os.getenv("UKMLA_SESSION_SWEEP_INTERVAL", "60"))
+SESSION_RESIZE_EVERY = 8   # memory backend: puts between size re-measurements
+
+
+def dump_session(session) -> bytes:
+    # JSON, never pickle: whoever can write to a shared store (sqlite
+    # file, RESP server) must not be able to run code in the workers
+    return json.dumps(session.to_state(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def load_session(data: bytes):
+    """Session from dump_session() bytes; None if unreadable (e.g. an old pickled entry)."""
+    from runner.session_state import Session   # session_state imports this module
+    try:
+        return Session.from_state(json.loads(data))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+# ============================================
+# 🧩 Store Interface
+# ============================================
+
+
+class SessionStore:
+    """
+    Backend contract. Sessions are opaque objects with `session_id` and
+    `last_seen` (epoch seconds); put() must be called after a session
+    is modified for non-memory backends to see the change.
+
+    `blocking` backends do disk/network I/O in get/put/delete; async
+    callers go through SessionRegistry's a* methods, which run them on
+    the blocking executor.
+    """
+
+    name = "base"
+    blocking = True
+
+    def get(self, session_id: str):
+        raise NotImplementedError
+
+    def put(self, session):
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        raise NotImplementedError
+
+    def sweep(self) -> int:
+        """Evicts expired sessions; returns how many were removed."""
+        return 0
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "sessions": len(self)}
+
+    def close(self):
+        pass
+
+# ============================================
+# 🧠 In-Process LRU + TTL
+# ============================================
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Live objects in an OrderedDict (least recently used first). A
+    session's serialized size is measured on its first put() and then
+    only every SESSION_RESIZE_EVERY puts (it runs inline on the event
+    loop); once the total passes the budget the least recently used
+    sessions are evicted.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, ttl: float = SESSION_TTL, max_bytes: int = SESSION_MEMORY_BUDGET):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sessions = OrderedDict()   # session_id -> (session, size, puts since measured)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.expired = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expired(self, session, now: float) -> bool:
+        return now - session.last_seen > self.ttl
+
+    def _pop(self, session_id: str):
+        session, size, _ = self._sessions.pop(session_id)
+        self._bytes -= size
+        return session
+
+    def get(self, session_id: str):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if self._expired(entry[0], time.time()):
+                self._pop(session_id)
+                self.expired += 1
+                return None
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def put(self, session):
+        entry = self._sessions.get(session.session_id)
+        if entry is not None and entry[0] is session and entry[2] + 1 < SESSION_RESIZE_EVERY:
+            size, puts = entry[1], entry[2] + 1
+        else:
+            size, puts = len(dump_session(session)), 0
+        with self._lock:
+            if session.session_id in self._sessions:
+                self._pop(session.session_id)
+            self._sessions[session.session_id] = (session, size, puts)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._sessions) > 1:
+                self._pop(next(iter(self._sessions)))
+                self.evicted += 1
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._pop(session_id)
+            return True
+
+    def sweep(self) -> int:
+        # LRU order ≈ idle order, so expired sessions sit at the front
+        now, removed = time.time(), 0
+        with self._lock:
+            while self._sessions:
+                session_id, (session, *_) = next(iter(self._sessions.items()))
+                if not self._expired(session, now):
+                    break
+                self._pop(session_id)
+                removed += 1
+            self.expired += removed
+        return removed
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "sessions": len(self._sessions),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+# ============================================
+# 💾 SQLite
+# ============================================
+
+
+class SQLiteSessionStore(SessionStore):
+    """One row per session (JSON blob + last_seen), WAL mode."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SESSION_DB_PATH, ttl: float = SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, data BLOB NOT NULL, last_seen REAL NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def get(self, session_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ? AND last_seen >= ?",
+                (session_id, time.time() - self.ttl)).fetchone()
+        return load_session(row[0]) if row else None
+
+    def put(self, session):
+        data = dump_session(session)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, last_seen) VALUES (?, ?, ?)",
+                (session.session_id, data, session.last_seen))
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE last_seen < ?", (time.time() - self.ttl,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# ============================================
+# 📡 RESP (Redis Protocol)
+# ============================================
+
+
+class RespError(Exception):
+    """Error reply (-ERR …) from a RESP server."""
+
+
+class RespClient:
+    """
+    Minimal blocking RESP2 client — just enough for GET/SET/DEL/DBSIZE,
+    so no redis package is needed. One connection, serialized by a lock,
+    reconnected once on a broken socket.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RespClient":
+        parsed = urlparse(url)
+        db = int(parsed.path.strip("/") or 0)
+        return cls(parsed.hostname or "127.0.0.1", parsed.port or 6379, db)
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.db:
+            self._roundtrip(("SELECT", self.db))
+
+    def _disconnect(self):
+        for closable in (self._reader, self._sock):
+            try:
+                if closable is not None:
+                    closable.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("RESP server closed the connection")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RespError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RespError(f"unexpected reply type {kind!r}")
+
+    def _roundtrip(self, args):
+        self._sock.sendall(self._encode(args))
+        return self._read_reply()
+
+    def execute(self, *args):
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._roundtrip(args)
+                except (OSError, ConnectionError):
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions as `ukmla:session:<id>` keys with a server-side expiry
+    refreshed on every put(), so the server does the TTL sweeping.
+    No session count: DBSIZE counts every key in the database and
+    SCAN-ing for ours is O(keys) per /metrics call.
+    """
+
+    name = "redis"
+    prefix = "ukmla:session:"
+
+    def __init__(self, url: str = SESSION_REDIS_URL, ttl: float = SESSION_TTL):
+        self.url = url
+        self.ttl = ttl
+        self.client = RespClient.from_url(url)
+
+    def get(self, session_id: str):
+        data = self.client.execute("GET", self.prefix + session_id)
+        return load_session(data) if data is not None else None
+
+    def put(self, session):
+        self.client.execute("SET", self.prefix + session.session_id, dump_session(session),
+                            "EX", max(1, int(self.ttl)))
+
+    def delete(self, session_id: str) -> bool:
+        return self.client.execute("DEL", self.prefix + session_id) > 0
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "url": self.url}
+
+    def close(self):
+        self.client.close()
+
+# ============================================
+# 🧹 Background Sweeper
+# ============================================
+
+
+class SessionSweeper:
+    """Daemon thread that calls store.sweep() every `interval` seconds."""
+
+    def __init__(self, store: SessionStore, interval: float = SWEEP_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self.swept = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "SessionSweeper":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="session-sweeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.swept += self.store.sweep()
+            except Exception as e:
+                print(f"⚠️ Session sweep failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+# ============================================
+# 🏭 Backend Factory
+# ============================================
+
+
+def create_session_store(backend: str = SESSION_BACKEND) -> SessionStore:
+    backend = backend.lower()
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore()
+    if backend == "redis":
+        return RedisSessionStore()
+    raise ValueError(f"unknown session backend: {backend!r} (memory, sqlite or redis)")
@@ -7,6 +7,7 @@ import os
 import uuid
 from edge_tts import Communicate
 from playsound import playsound  # ✅ Cross-platform audio playback
+from runner.executor import run_blocking
 
 # ============================================
 # 🗣️ Default Voice Settings
@@ -43,11 +44,59 @@ async def speak_text(text: str):
         # Save TTS output
         await communicate.save(file_name)
 
-        # Play the audio
-        playsound(file_name)
+        # Play the audio (blocking — on the executor, not the event loop)
+        await run_blocking("audio", playsound, file_name)
 
         # Auto-delete after playing
         os.remove(file_name)
 
     except Exception as e:
         print(f"❌ TTS Error: {e}")
+
+# ============================================
+# 🎧 In-Memory Synthesis + Playback
+# Used by the sentence pipeline (runner/tts_pipeline.py)
+# ============================================
+
+
+async def synthesize_text(text: str) -> bytes:
+    """
+    Synthesizes text with Edge TTS and returns the MP3 bytes
+    (no temp file).
+    """
+    communicate = Communicate(
+        text=text,
+        voice=DEFAULT_VOICE,
+        rate=DEFAULT_RATE,
+        pitch=DEFAULT_PITCH
+    )
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+    return bytes(audio)
+
+
+async def play_audio_bytes(audio: bytes):
+    """
+    Plays MP3 bytes without blocking the event loop, so the next
+    sentence can be synthesized while this one plays.
+    """
+    if not audio:
+        return
+    try:
+        await run_blocking("audio", _play_mp3, audio)
+    except Exception as e:
+        print(f"❌ TTS Error: {e}")
+
+
+def _play_mp3(audio: bytes):
+    # Temp-file write, playback and cleanup all block — run off the loop
+    file_name = f"tts_{uuid.uuid4().hex}.mp3"
+    try:
+        with open(file_name, "wb") as f:
+            f.write(audio)
+        playsound(file_name)
+    finally:
+        if os.path.exists(file_name):
+            os.remove(file_name)
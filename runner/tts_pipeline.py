@@ -0,0 +1,121 @@
+# ============================================
+# 🎙️ SENTENCE-PIPELINED TTS
+# Splits a streamed LLM reply into sentences as they complete and
+# synthesizes sentence N while the LLM is still writing N+1.
+# Audio segments always come out in sentence order.
+# ============================================
+
+import re
+import asyncio
+from runner.tts_module import synthesize_text, play_audio_bytes
+
+# ============================================
+# ⚙️ Pipeline Settings
+# ============================================
+
+MAX_SYNTH_AHEAD = 3       # sentences synthesizing at once
+MIN_SENTENCE_CHARS = 12   # merge tiny fragments like "Yes." into the next one
+
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+_ABBREVIATIONS = {"dr", "mr", "mrs", "ms", "st", "vs", "e.g", "i.e"}
+
+# ============================================
+# ✂️ Sentence Splitter
+# ============================================
+
+
+def _split_ready(buffer: str) -> tuple[list, str]:
+    """
+    Returns (complete sentences, leftover text) for the current buffer.
+    A boundary is only accepted once whitespace follows it, so "3.5" or a
+    half-streamed "Dr." is never cut.
+    """
+    sentences, start = [], 0
+    for match in _SENTENCE_END.finditer(buffer):
+        end = match.end()
+        words = buffer[start:match.start()].split()
+        if words and words[-1].lower().rstrip(".") in _ABBREVIATIONS:
+            continue
+        candidate = buffer[start:end].strip()
+        if len(candidate) < MIN_SENTENCE_CHARS:
+            continue
+        sentences.append(candidate)
+        start = end
+    return sentences, buffer[start:]
+
+
+async def iter_sentences(deltas):
+    """
+    Async generator: consumes text deltas, yields whole sentences.
+    """
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        sentences, buffer = _split_ready(buffer)
+        for sentence in sentences:
+            yield sentence
+    if buffer.strip():
+        yield buffer.strip()
+
+# ============================================
+# 🔁 LLM → TTS Pipeline
+# ============================================
+
+
+async def pipeline_tts(deltas, clean=None, max_ahead: int = MAX_SYNTH_AHEAD):
+    """
+    Async generator yielding (sentence, mp3_bytes) in order.
+
+    Args:
+        deltas: Async iterable of streamed reply text
+        clean (callable): Optional per-sentence cleaner (e.g. clean_response)
+        max_ahead (int): How many sentences may synthesize concurrently
+    """
+    queue = asyncio.Queue(maxsize=max_ahead)
+
+    async def produce():
+        try:
+            async for sentence in iter_sentences(deltas):
+                if clean is not None:
+                    sentence = clean(sentence)
+                if sentence:
+                    task = asyncio.create_task(synthesize_text(sentence))
+                    await queue.put((sentence, task))
+        finally:
+            await queue.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            sentence, task = item
+            try:
+                audio = await task
+            except Exception as e:
+                print(f"❌ TTS Error: {e}")
+                audio = b""
+            yield sentence, audio
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is not None:
+                item[1].cancel()
+
+
+async def speak_reply_stream(deltas, clean=None) -> str:
+    """
+    Plays a streamed reply sentence by sentence as audio becomes ready.
+
+    Returns:
+        str: The full spoken reply
+    """
+    spoken = []
+    async for sentence, audio in pipeline_tts(deltas, clean=clean):
+        spoken.append(sentence)
+        await play_audio_bytes(audio)
+    return " ".join(spoken)
@@ -0,0 +1,19 @@
+from runner.near_duplicates import NearDuplicateIndex
+
+
+def test_rewording_is_a_repeat():
+    index = NearDuplicateIndex()
+    assert index.add("Do you smoke?") is None
+    assert index.add("Um, do you smoke at all?") == ("Do you smoke?", 1.0)
+
+
+def test_quantity_follow_up_is_not_a_repeat():
+    index = NearDuplicateIndex()
+    index.add("Do you smoke?")
+    assert index.add("How much do you smoke?") is None
+
+
+def test_ever_follow_up_is_not_a_repeat():
+    index = NearDuplicateIndex()
+    index.add("Do you smoke?")
+    assert index.add("Have you ever smoked?") is None